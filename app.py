@@ -1,8 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import hmac
 import io
 import os
 import re
@@ -15,7 +17,7 @@ def _lc(name, lo=0.05, hi=0.25):
     return mcolors.LinearSegmentedColormap.from_list(
         f'{name}_light', plt.get_cmap(name)(np.linspace(lo, hi, 256)))
 
-# Light colormap palette — used in all background_gradient calls
+# Light colormap palette — used by gradient() for every heat-shaded table
 _LC = {
     'Blues':    _lc('Blues',    0.05, 0.45),
     'Greens':   _lc('Greens',   0.05, 0.45),
@@ -24,14 +26,31 @@ _LC = {
     'Purples':  _lc('Purples',  0.05, 0.45),
     'RdYlGn':   _lc('RdYlGn',   0.12, 0.88),
     'RdYlGn_r': _lc('RdYlGn_r', 0.12, 0.88),
+    'RdWhGn':   mcolors.LinearSegmentedColormap.from_list('rg_div', ['#dc2626', '#ffffff', '#16a34a']),
 }
 
+def _lut(cmap):
+    """Hex colour and needs-light-text flag for every colormap entry, with the NaN ('bad') colour last."""
+    rgba = np.vstack([cmap(np.arange(cmap.N)), cmap(np.nan)])
+    lin = np.where(rgba[:, :3] <= 0.04045, rgba[:, :3] / 12.92, ((rgba[:, :3] + 0.055) / 1.055) ** 2.4)
+    return np.array([mcolors.rgb2hex(c) for c in rgba]), lin @ np.array([0.2126, 0.7152, 0.0722]) < 0.408
+
+# Lookup tables for _LC, so shading a table is pure numpy indexing
+_LC_LUT = {name: _lut(cmap) for name, cmap in _LC.items()}
+
 # --- TRY IMPORTING FPDF ---
 try:
     from fpdf import FPDF
 except ImportError:
     FPDF = None
 
+# --- EXCEL ENGINE: Rust calamine when installed, else pandas' default (openpyxl / xlrd) ---
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
 # --- 1. CONFIGURATION & STYLING ---
 st.set_page_config(page_title="RadOnc Analytics", layout="wide", page_icon="🩺")
 
@@ -118,16 +137,17 @@ def inject_custom_css():
 
 inject_custom_css()
 
+TREND_CSS = {'▲': 'color: #16a34a; font-weight: 700; font-size: 20px',
+             '▼': 'color: #dc2626; font-weight: 700; font-size: 20px'}
+
 def render_table(styled_df, height=None):
     data = styled_df.data
     show_idx = not isinstance(data.index, pd.RangeIndex)
     s = styled_df
-    # Trend arrows: large, bold, coloured
+    # Trend arrows: large, bold, coloured (one column-wise lookup, not a call per cell)
     if 'Trend' in data.columns:
-        s = s.map(
-            lambda v: ('color: #16a34a; font-weight: 700; font-size: 20px' if v == '▲'
-                  else 'color: #dc2626; font-weight: 700; font-size: 20px' if v == '▼'
-                  else 'color: #64748b'),
+        s = s.apply(
+            lambda col: col.map(TREND_CSS).fillna('color: #64748b'),
             subset=['Trend'],
         )
     # Bold row-label index when it carries meaningful names
@@ -141,6 +161,38 @@ def render_table(styled_df, height=None):
     h = height if height else ((n_rows + 1) * 36 + 4)
     st.dataframe(s, hide_index=not show_idx, use_container_width=True, height=h)
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def gradient_css(data, cmap_name, vmin=None, vmax=None):
+    """Per-cell CSS matching Styler.background_gradient (column-wise), computed once per table."""
+    vals = data.to_numpy(dtype=float)
+    lo = np.nanmin(vals, axis=0) if vmin is None else np.full(vals.shape[1], vmin, dtype=float)
+    hi = np.nanmax(vals, axis=0) if vmax is None else np.full(vals.shape[1], vmax, dtype=float)
+    rng = hi - lo
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norm = np.where(rng > 0, (vals - lo) / np.where(rng > 0, rng, 1), 0.0)
+    colors, dark = _LC_LUT[cmap_name]
+    n = len(colors) - 1
+    idx = np.where(np.isnan(vals), n, np.clip(np.nan_to_num(norm * n), 0, n - 1)).astype(int)
+    hexes, dark = colors[idx], dark[idx]
+    css = np.char.add(np.char.add(np.char.add('background-color: ', hexes), ';color: '),
+                      np.where(dark, '#f1f1f1', '#000000'))
+    return pd.DataFrame(np.char.add(css, ';'), index=data.index, columns=data.columns)
+
+def gradient(styler, cmap_name, subset=None, vmin=None, vmax=None):
+    """Drop-in for Styler.background_gradient that reuses cached CSS across reruns."""
+    if subset is None:
+        subset = styler.data.select_dtypes(include=np.number).columns.tolist()
+    css = gradient_css(styler.data[subset], cmap_name, vmin, vmax)
+    return styler.apply(lambda _: css, axis=None, subset=subset)
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def excel_bytes(df, sheet_name):
+    """xlsx download payload for a table, written once per distinct table rather than on every rerun."""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return buf.getvalue()
+
 def render_section_header(title, subtitle=None, icon=""):
     sub_html = f'<p>{subtitle}</p>' if subtitle else ""
     st.markdown(
@@ -188,6 +240,31 @@ def style_high_end_chart(fig):
     fig.update_yaxes(zeroline=False)
     return fig
 
+# Figure builders for the heavier charts, cached on their input frame so a rerun
+# that only changes an unrelated widget reuses the finished figure.
+PX_DATA_ARGS = ('x', 'y', 'color', 'text', 'hover_name', 'hover_data', 'values', 'names', 'facet_row', 'facet_col')
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_chart(kind, df, layout=None, traces=None, **kwargs):
+    """px.<kind>(df, **kwargs), then update_layout(**layout) / update_traces(**traces), in the house style."""
+    import plotly.express as px   # local: module-level px is only bound past the password gate
+    fig = getattr(px, kind)(df, **kwargs)
+    if layout:
+        fig.update_layout(**layout)
+    if traces:
+        fig.update_traces(**traces)
+    return style_high_end_chart(fig)
+
+def cached_chart(kind, df, **kwargs):
+    """build_chart on just the columns the chart plots, so the cache key and figure carry nothing else."""
+    used = []
+    for arg in PX_DATA_ARGS:
+        val = kwargs.get(arg)
+        for col in ([val] if isinstance(val, str) else val or []):
+            if col in df.columns and col not in used:
+                used.append(col)
+    return build_chart(kind, df[used], **kwargs)
+
 # --- PDF GENERATOR ---
 if FPDF:
     class PDFReport(FPDF):
@@ -232,9 +309,9 @@ if FPDF:
         pdf.cell(50, 10, "Total wRVUs", 1, 1, 'C')
         pdf.set_font('Arial', '', 10)
         if not provider_df.empty:
-            for _, row in provider_df.iterrows():
-                pdf.cell(90, 10, str(row['Name']), 1, 0)
-                pdf.cell(50, 10, f"{row['Total RVUs']:,.2f}", 1, 1, 'R')
+            for name, rvus in zip(provider_df['Name'], provider_df['Total RVUs']):
+                pdf.cell(90, 10, str(name), 1, 0)
+                pdf.cell(50, 10, f"{rvus:,.2f}", 1, 1, 'R')
         else:
             pdf.cell(0, 10, "No individual provider data found for this period.", 1, 1)
         return pdf.output(dest='S').encode('latin-1')
@@ -242,19 +319,31 @@ if FPDF:
 # --- PASSWORD ---
 APP_PASSWORD = "test2026"
 
+def expected_password():
+    """APP_PASSWORD from .streamlit/secrets.toml when one is configured, else the built-in default."""
+    try:
+        return str(st.secrets.get("APP_PASSWORD", APP_PASSWORD))
+    except FileNotFoundError:
+        return APP_PASSWORD
+
+def password_digest(text):
+    """Fixed-size digest, so compare_digest's timing does not depend on either password's length."""
+    return hashlib.blake2b(text.encode(), digest_size=32).digest()
+
 def check_password():
     def password_entered():
-        if st.session_state.get("password") == APP_PASSWORD:
+        entered = st.session_state.get("password") or ""
+        if hmac.compare_digest(password_digest(entered), password_digest(expected_password())):
             st.session_state["password_correct"] = True
             del st.session_state["password"]
         else:
             st.session_state["password_correct"] = False
 
     if "password_correct" not in st.session_state:
-        st.text_input("🔒 Enter Dashboard Password:", type="password", on_change=password_entered, key="password")
+        st.text_input("Enter Dashboard Password:", type="password", on_change=password_entered, key="password")
         return False
     elif not st.session_state["password_correct"]:
-        st.text_input("❌ Incorrect password. Try again:", type="password", on_change=password_entered, key="password")
+        st.text_input("Incorrect password. Try again:", type="password", on_change=password_entered, key="password")
         return False
     return True
 
@@ -269,90 +358,178 @@ HISTORICAL_DATA = {
     2025: {"CENT": 22236, "Dickson": 12954, "Skyline": 13931, "Summit": 9225, "Stonecrest": 11873, "STW": 22024, "Midtown": 19172, "MURF": 43857, "Sumner": 24169, "TOPC": 37515, "LROC": 14528, "TROC": 9042}
 }
 
-if check_password():
+# ==========================================
+# CONFIGURATION
+# ==========================================
+CLINIC_CONFIG = {
+    "CENT":       {"name": "Centennial",        "fte": 2.2},
+    "Dickson":    {"name": "Horizon",            "fte": 1.0},
+    "LROC":       {"name": "LROC (Lebanon)",     "fte": 1.2},
+    "Skyline":    {"name": "Skyline",            "fte": 1.0},
+    "Midtown":    {"name": "ST Midtown",         "fte": 1.8},
+    "MURF":       {"name": "ST Rutherford",      "fte": 2.0},
+    "STW":        {"name": "ST West",            "fte": 1.8},
+    "Stonecrest": {"name": "StoneCrest",         "fte": 1.0},
+    "Summit":     {"name": "Summit",             "fte": 1.0},
+    "Sumner":     {"name": "Sumner",             "fte": 1.5},
+    "TROC":       {"name": "TROC (Tullahoma)",   "fte": 0.6},
+    "TOPC":       {"name": "TN Proton Center",   "fte": 2.5},
+}
+TRISTAR_IDS   = ["CENT", "Skyline", "Dickson", "Summit", "Stonecrest"]
+ASCENSION_IDS = ["STW", "Midtown", "MURF"]
+# Number of linear accelerators (LINACs) per site — used for per-machine productivity benchmarks.
+# TOPC is intentionally excluded (proton therapy, not LINAC-based).
+LINAC_CONFIG = {
+    "CENT": 2, "Midtown": 2, "STW": 2, "MURF": 2,
+    "Sumner": 1, "Dickson": 1, "Skyline": 1, "Summit": 1,
+    "LROC": 1, "TROC": 1, "Stonecrest": 1,
+}
 
-    # ==========================================
-    # CONFIGURATION
-    # ==========================================
-    CLINIC_CONFIG = {
-        "CENT":       {"name": "Centennial",        "fte": 2.2},
-        "Dickson":    {"name": "Horizon",            "fte": 1.0},
-        "LROC":       {"name": "LROC (Lebanon)",     "fte": 1.2},
-        "Skyline":    {"name": "Skyline",            "fte": 1.0},
-        "Midtown":    {"name": "ST Midtown",         "fte": 1.8},
-        "MURF":       {"name": "ST Rutherford",      "fte": 2.0},
-        "STW":        {"name": "ST West",            "fte": 1.8},
-        "Stonecrest": {"name": "StoneCrest",         "fte": 1.0},
-        "Summit":     {"name": "Summit",             "fte": 1.0},
-        "Sumner":     {"name": "Sumner",             "fte": 1.5},
-        "TROC":       {"name": "TROC (Tullahoma)",   "fte": 0.6},
-        "TOPC":       {"name": "TN Proton Center",   "fte": 2.5},
-    }
-    TRISTAR_IDS   = ["CENT", "Skyline", "Dickson", "Summit", "Stonecrest"]
-    ASCENSION_IDS = ["STW", "Midtown", "MURF"]
-    # Number of linear accelerators (LINACs) per site — used for per-machine productivity benchmarks.
-    # TOPC is intentionally excluded (proton therapy, not LINAC-based).
-    LINAC_CONFIG = {
-        "CENT": 2, "Midtown": 2, "STW": 2, "MURF": 2,
-        "Sumner": 1, "Dickson": 1, "Skyline": 1, "Summit": 1,
-        "LROC": 1, "TROC": 1, "Stonecrest": 1,
-    }
-
-    PROVIDER_CONFIG = {
-        "Burke": 1.0, "Castle": 0.6, "Chen": 1.0, "Cohen": 1.0,
-        "Cooper": 1.0, "Ellis": 1.0, "Escott": 1.0, "Friedman": 1.0,
-        "Gray": 1.0, "Jones": 1.0, "Lee": 1.0, "Lewis": 1.0, "Lipscomb": 0.6,
-        "Lydon": 1.0, "Mayo": 1.0, "Mondschein": 1.0, "Nguyen": 1.0,
-        "Osborne": 1.0, "Phillips": 1.0, "Sittig": 1.0,
-        "Strickler": 1.0, "Wakefield": 1.0, "Wendt": 1.0, "Whitaker": 1.0,
-    }
-    # Physicians who left mid-year: labeled "(Ret.)" in tables, excluded from
-    # trend/heatmap/distribution charts where partial data distorts the view.
-    RETIRED_PROVIDERS = {"Wendt"}
-    PROVIDER_KEYS_UPPER = {k.upper(): k for k in PROVIDER_CONFIG.keys()}
-    APP_LIST = ["Burke", "Ellis", "Lewis", "Lydon"]
-
-    TARGET_CATEGORIES = ["E&M OFFICE CODES", "RADIATION CODES", "SPECIAL PROCEDURES"]
-    IGNORED_SHEETS   = ["RAD PHYSICIAN WORK RVUS", "COVER", "SHEET1", "TOTALS", "PROTON PHYSICIAN WORK RVUS",
-                        "LROC PHYSICIAN WORK RVUS", "TROC PHYSICIAN WORK RVUS",
-                        "LROC POS WORK RVUS", "TROC POS WORK RVUS"]
-    SERVER_DIR       = "Reports"
-    # Approximate MGMA Radiation Oncology physician benchmarks (annual wRVUs)
-    MGMA_BENCHMARKS  = {"25th": 6500, "50th": 9000, "75th": 11500}
-
-    # CPT conversion rates for follow-up visit counting
-    APP_CPT_RATES = {"99212": 0.7, "99213": 1.3, "99214": 1.92, "99215": 2.8}
-
-    # Conversion factors for 77263 (wRVU value → procedure count)
-    CONSULT_CONV = {2026: 3.06, "default": 3.14}
-
-    # 2026 PC wRVU value for 77470 (Special Treatment Procedure) → procedure count
-    CPT_77470_WRVU = 2.03
-
-    POS_ROW_MAPPING = {
-        "CENTENNIAL RAD":     "CENT",
-        "DICKSON RAD":        "Dickson",
-        "MIDTOWN RAD":        "Midtown",
-        "MURFREESBORO RAD":   "MURF",
-        "SAINT THOMAS WEST RAD": "STW",
-        "SKYLINE RAD":        "Skyline",
-        "STONECREST RAD":     "Stonecrest",
-        "SUMMIT RAD":         "Summit",
-        "SUMNER RAD":         "Sumner",
-        "LEBANON RAD":        "LROC",
-        "TULLAHOMA RADIATION":"TROC",
-        "TO PROTON":          "TOPC",
-    }
+PROVIDER_CONFIG = {
+    "Burke": 1.0, "Castle": 0.6, "Chen": 1.0, "Cohen": 1.0,
+    "Cooper": 1.0, "Ellis": 1.0, "Escott": 1.0, "Friedman": 1.0,
+    "Gray": 1.0, "Jones": 1.0, "Lee": 1.0, "Lewis": 1.0, "Lipscomb": 0.6,
+    "Lydon": 1.0, "Mayo": 1.0, "Mondschein": 1.0, "Nguyen": 1.0,
+    "Osborne": 1.0, "Phillips": 1.0, "Sittig": 1.0,
+    "Strickler": 1.0, "Wakefield": 1.0, "Wendt": 1.0, "Whitaker": 1.0,
+}
+# Physicians who left mid-year: labeled "(Ret.)" in tables, excluded from
+# trend/heatmap/distribution charts where partial data distorts the view.
+RETIRED_PROVIDERS = {"Wendt"}
+PROVIDER_KEYS_UPPER = {k.upper(): k for k in PROVIDER_CONFIG.keys()}
+# Known misspellings in tab / row names -> canonical provider key
+NAME_FIXES = {"FRIEDMEN": "Friedman"}
+APP_LIST = ["Burke", "Ellis", "Lewis", "Lydon"]
+PROVIDER_SET = frozenset(PROVIDER_CONFIG)
+APP_SET = frozenset(APP_LIST)
+
+TARGET_CATEGORIES = ["E&M OFFICE CODES", "RADIATION CODES", "SPECIAL PROCEDURES"]
+TARGET_SET        = frozenset(c.upper() for c in TARGET_CATEGORIES)
+IGNORED_SHEETS   = ["RAD PHYSICIAN WORK RVUS", "COVER", "SHEET1", "TOTALS", "PROTON PHYSICIAN WORK RVUS",
+                    "LROC PHYSICIAN WORK RVUS", "TROC PHYSICIAN WORK RVUS",
+                    "LROC POS WORK RVUS", "TROC POS WORK RVUS"]
+IGNORED_RE       = re.compile("|".join(map(re.escape, IGNORED_SHEETS)))   # any ignored tab name as a substring
+SERVER_DIR       = "Reports"
+# Widgets inside the lazily rendered tabs whose selections must survive a tab switch
+TAB_WIDGET_KEYS  = ("clinic_radio_26", "clinic_radio_25", "sel_month_26", "sel_month_25",
+                    "md_radio_26", "md_radio_25", "fin_radio")
+# Approximate MGMA Radiation Oncology physician benchmarks (annual wRVUs)
+MGMA_BENCHMARKS  = {"25th": 6500, "50th": 9000, "75th": 11500}
+
+# CPT conversion rates for follow-up visit counting
+APP_CPT_RATES = {"99212": 0.7, "99213": 1.3, "99214": 1.92, "99215": 2.8}
+
+# Conversion factors for 77263 (wRVU value → procedure count)
+CONSULT_CONV = {2026: 3.06, "default": 3.14}
+
+# 2026 PC wRVU value for 77470 (Special Treatment Procedure) → procedure count
+CPT_77470_WRVU = 2.03
+
+POS_ROW_MAPPING = {
+    "CENTENNIAL RAD":     "CENT",
+    "DICKSON RAD":        "Dickson",
+    "MIDTOWN RAD":        "Midtown",
+    "MURFREESBORO RAD":   "MURF",
+    "SAINT THOMAS WEST RAD": "STW",
+    "SKYLINE RAD":        "Skyline",
+    "STONECREST RAD":     "Stonecrest",
+    "SUMMIT RAD":         "Summit",
+    "SUMNER RAD":         "Sumner",
+    "LEBANON RAD":        "LROC",
+    "TULLAHOMA RADIATION":"TROC",
+    "TO PROTON":          "TOPC",
+}
+
+if check_password():
+    # Plotly is only needed once past the password gate; importing it here keeps
+    # the login screen's cold start light.
+    import plotly.express as px
+    import plotly.graph_objects as go
 
     class LocalFile:
         def __init__(self, path):
             self.path = path
             self.name = os.path.basename(path).upper()
 
+        def getvalue(self):
+            with open(self.path, "rb") as fh:
+                return fh.read()
+
+    def file_payload(file_obj):
+        """
+        Hashable (FILENAME, full path, content) entry for a server file or an upload.
+        Server files carry (mtime_ns, size) instead of their bytes, so a rerun only stats
+        them; parse_workbook reads the file itself when the cache misses.
+        """
+        if isinstance(file_obj, LocalFile):
+            info = os.stat(file_obj.path)
+            return file_obj.name, file_obj.path, (info.st_mtime_ns, info.st_size)
+        filename = file_obj.name.upper()
+        return filename, filename, file_obj.getvalue()
+
     # ==========================================
     # UTILITY FUNCTIONS
     # ==========================================
 
+    def read_workbook(source, keep=None):
+        """
+        Read an Excel workbook (no header row) with the Rust calamine reader.
+        Sheet names are checked against keep() before parsing, so skipped tabs cost nothing.
+        calamine never builds openpyxl's per-cell style objects, so it is already
+        lighter than openpyxl's read_only cursor; keep it over a hand-rolled row loop.
+        Without python-calamine, pandas picks openpyxl / xlrd from the file type.
+        """
+        with pd.ExcelFile(source, engine=EXCEL_ENGINE) as book:
+            return {sn: book.parse(sn, header=None)
+                    for sn in book.sheet_names if keep is None or keep(sn)}
+
+    @lru_cache(maxsize=None)
+    def classify_sheet(sheet_name):
+        """
+        Name-derived dispatch facts for a sheet, computed once per distinct tab name
+        (every monthly workbook repeats the same tabs) and shared by wanted_sheet,
+        the main sheet loop and the 77470 scan:
+        (clean_name, s_upper, provider match, is "<clinic> prov" detail tab, is ignored tab,
+         name to file provider-level RVU rows under)
+        """
+        clean_name = sheet_name.strip()
+        s_upper    = sheet_name.upper()
+        return (clean_name, s_upper, match_provider(clean_name),
+                clean_name.lower().endswith(" prov"),
+                IGNORED_RE.search(s_upper) is not None,
+                NAME_FIXES.get(clean_name.upper(), clean_name))
+
+    def wanted_sheet(sheet_name, file_kind, file_tag):
+        """
+        Name-only pre-filter mirroring the sheet loops in parse_workbook:
+        False for sheets that every consumer would skip anyway.
+        """
+        clean_name, s_upper, match_prov, is_detail, is_ignored, _ = classify_sheet(sheet_name)
+        if file_kind == "new_patient":
+            return ("POS" in s_upper and "TREND" in s_upper) or "PHYS YTD OV" in s_upper
+        # Trend tabs other than productivity trends are skipped, except the bare
+        # "Trend" sheet in LROC/TROC 2026 files, which is the productivity data
+        if "TREND" in s_upper and "PRODUCTIVITY TREND" not in s_upper:
+            return s_upper == "TREND" and file_tag in ["LROC", "TROC"]
+        if match_prov or is_detail or clean_name in CLINIC_CONFIG:
+            return True
+        if is_ignored:
+            return False
+        return "PROTON POS" not in s_upper or "PRODUCTIVITY TREND" in s_upper
+
+    @lru_cache(maxsize=1024)
+    def parse_month_text(x):
+        """Month-start Timestamp for a stripped date string (cached: the same headers repeat on every sheet)."""
+        for fmt in ('%b-%y', '%b-%Y', '%B %Y', '%Y-%m-%d'):
+            try:
+                return pd.Timestamp(pd.to_datetime(x, format=fmt)).replace(day=1)
+            except Exception:
+                pass
+        try:
+            return pd.Timestamp(pd.to_datetime(x)).replace(day=1)
+        except Exception:
+            return pd.NaT
+
     def standardize_date(x):
         """Normalize any date value to the 1st of its month as a Timestamp."""
         if pd.isna(x):
@@ -360,20 +537,16 @@ if check_password():
         if isinstance(x, (datetime, pd.Timestamp)):
             return pd.Timestamp(year=x.year, month=x.month, day=1)
         if isinstance(x, str):
-            x = x.strip()
-            for fmt in ('%b-%y', '%b-%Y', '%B %Y', '%Y-%m-%d'):
-                try:
-                    return pd.Timestamp(pd.to_datetime(x, format=fmt)).replace(day=1)
-                except Exception:
-                    pass
-            try:
-                return pd.Timestamp(pd.to_datetime(x)).replace(day=1)
-            except Exception:
-                pass
+            return parse_month_text(x.strip())
         return pd.NaT
 
+    # File / folder name patterns, compiled once (every workbook is checked against them)
+    FILE_MONTH_RE      = re.compile(r'(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s*(\d{2,4})', re.IGNORECASE)
+    FILE_MONTH_YEAR_RE = re.compile(r'(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s*(20)?(\d{2})\b', re.IGNORECASE)
+    FILE_YEAR_RE       = re.compile(r'\b(20[2-9]\d)\b')
+
     def get_date_from_filename(filename):
-        match = re.search(r'(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s*(\d{2,4})', filename, re.IGNORECASE)
+        match = FILE_MONTH_RE.search(filename)
         if match:
             month_str, year_str = match.group(1), match.group(2)
             if len(year_str) == 2:
@@ -384,11 +557,11 @@ if check_password():
     def get_target_year_from_text(text):
         """Extract the reporting year from a folder path or filename."""
         # Prefer month+year patterns first (most specific)
-        match = re.search(r'(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s*(20)?(\d{2})\b', text, re.IGNORECASE)
+        match = FILE_MONTH_YEAR_RE.search(text)
         if match:
             return int("20" + match.group(3)[-2:])
         # Fall back to bare 4-digit year
-        match2 = re.search(r'\b(20[2-9]\d)\b', text)
+        match2 = FILE_YEAR_RE.search(text)
         if match2:
             return int(match2.group(1))
         return None
@@ -421,9 +594,7 @@ if check_password():
             if not parts:
                 return None
             last = parts[0].upper()
-            if last == "FRIEDMEN":
-                last = "FRIEDMAN"
-            return PROVIDER_KEYS_UPPER.get(last)
+            return NAME_FIXES.get(last) or PROVIDER_KEYS_UPPER.get(last)
         except Exception:
             return None
 
@@ -434,6 +605,7 @@ if check_password():
         base = name_str.split(",")[0].strip() if "," in name_str else name_str
         return base.split()[0] if base.split() else name_str
 
+    @st.cache_data(show_spinner=False)
     def get_historical_df():
         records = []
         for year, data in HISTORICAL_DATA.items():
@@ -454,28 +626,49 @@ if check_password():
     # FIND DATE HEADER ROW  (FIX #1)
     # Returns the INTEGER row *position* (for iloc) of the best date header.
     # ==========================================
+    MONTH_ABBRS = ("JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG","SEP","OCT","NOV","DEC")
+    DATE_TYPES  = (datetime, pd.Timestamp)
+
+    # Header-cell patterns, compiled once and shared by the parsers below
+    MONTH_RE     = re.compile("|".join(MONTH_ABBRS), re.IGNORECASE)           # month name anywhere
+    MON_YY_RE    = re.compile(r'[A-Za-z]{3}-\d{2}')                          # "Jan-26"-like token
+    MONTH_YY_RE  = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-\d{2}', re.IGNORECASE)
+
+    def sheet_cells(df):
+        """A sheet as one object array; parsers accept either, so a caller can convert once and share it."""
+        return df if isinstance(df, np.ndarray) else df.to_numpy(dtype=object)
+
     def find_date_row(df):
-        months = ["JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG","SEP","OCT","NOV","DEC"]
-        best_pos, max_score = 1, 0
-        for r in range(min(10, len(df))):
-            row_vals = df.iloc[r, 4:16]
-            str_vals  = [str(v).upper() for v in row_vals if pd.notna(v)]
-            text_hits = sum(1 for v in str_vals if any(m in v for m in months))
-            dt_hits   = sum(1 for v in row_vals if isinstance(v, (datetime, pd.Timestamp)))
-            score     = text_hits + dt_hits * 2
-            if score > max_score:
-                max_score = score
-                best_pos  = r
-        return best_pos   # positional index, safe for iloc
+        # Score the first 10 rows of columns E..P in one pass:
+        # +1 per cell naming a month, +2 per real date cell.
+        # df may also be the sheet's to_numpy(dtype=object) array, saving a second slice.
+        if isinstance(df, np.ndarray):
+            cells = df[:10, 4:16]
+        else:
+            cells = df.iloc[:10, 4:16].to_numpy(dtype=object)
+        if cells.size == 0:
+            return 1
+        scores = np.fromiter(map(date_cell_score, cells.flat), int, cells.size).reshape(cells.shape).sum(axis=1)
+        return int(scores.argmax()) if scores.max() > 0 else 1   # positional index, safe for iloc
+
+    def date_cell_score(v):
+        """find_date_row's per-cell score; numbers and dates print without letters, so only other cells hit the regex."""
+        if isinstance(v, DATE_TYPES):
+            return 2
+        if isinstance(v, (int, float)):
+            return 0
+        return 1 if MONTH_RE.search(str(v)) else 0
 
     # ==========================================
     # PARSERS
     # ==========================================
 
-    def parse_rvu_sheet(df, sheet_name, entity_type, clinic_tag="General", forced_fte=None, target_year=None):
+    def parse_rvu_sheet(df, sheet_name, entity_type, clinic_tag="General", forced_fte=None, target_year=None,
+                        header_pos=None):
         """
         Parse a standard RVU sheet (clinic or provider).
-        FIX #1 applied: uses iloc with positional column index via enumerate.
+        FIX #1 applied: month columns are addressed positionally via iloc.
+        header_pos may be passed in when the caller already located the date row.
         """
         if entity_type == 'clinic':
             cfg  = CLINIC_CONFIG.get(sheet_name, {"name": sheet_name, "fte": 1.0})
@@ -485,62 +678,69 @@ if check_password():
             name = sheet_name
             fte  = forced_fte if forced_fte else PROVIDER_CONFIG.get(sheet_name, 1.0)
 
-        df = df.copy()
-        df.iloc[:, 0] = df.iloc[:, 0].astype(str).str.strip().str.upper()
-        mask      = df.iloc[:, 0].isin(TARGET_CATEGORIES)
-        data_rows = df[mask].copy()
-
-        header_pos = find_date_row(df)   # positional row index
-        records    = []
-        ncols      = len(df.columns)
-
-        # FIX #1: iterate by positional column index (not label)
-        for col_pos in range(4, ncols):
-            dt_clean = standardize_date(df.iloc[header_pos, col_pos])
-            if pd.isna(dt_clean):
-                continue
-            if target_year and dt_clean.year != target_year:
-                continue
-            col_sum = pd.to_numeric(data_rows.iloc[:, col_pos], errors='coerce').sum()
-            records.append({
-                "Type":       entity_type,
-                "ID":         sheet_name,
-                "Name":       name,
-                "FTE":        fte,
-                "Month_Clean": dt_clean,
-                "Total RVUs": col_sum,
-                "RVU per FTE": col_sum / fte if fte > 0 else 0,
-                "Clinic_Tag": clinic_tag,
-                "source_type": "standard",
-            })
-        return pd.DataFrame(records)
-
-    def parse_app_cpt_data(df, provider_name, log, target_year=None):
+        # Work on one object array. Only text cells in column A can name a target
+        # category, so numbers/blanks are rejected by type before any string work.
+        cells = sheet_cells(df)
+        mask  = np.fromiter((isinstance(v, str) and v.strip().upper() in TARGET_SET for v in cells[:, 0]),
+                            bool, len(cells))
+
+        if header_pos is None:
+            header_pos = find_date_row(cells)   # positional row index
+
+        # Month columns start at E; resolve every header and column total in one pass
+        header = cells[header_pos, 4:]
+        months = pd.to_datetime(pd.Series(header).map(standardize_date)).to_numpy()
+        keep   = ~pd.isna(months)
+        if target_year:
+            keep &= pd.DatetimeIndex(months).year == target_year
+        if not keep.any():
+            return []
+
+        # Coerce only the target rows' kept month columns, as one flat array
+        block  = cells[mask, 4:][:, keep]
+        nums   = pd.to_numeric(block.ravel(), errors='coerce').astype(float).reshape(block.shape)
+        totals  = np.nansum(nums, axis=0)
+        per_fte = totals / fte if fte > 0 else np.zeros_like(totals)
+        # Row records, like the CPT/visit parsers: process_files builds one frame for all sheets
+        return [{"Type": entity_type, "ID": sheet_name, "Name": name, "FTE": fte,
+                 "Month_Clean": month, "Total RVUs": total, "RVU per FTE": rate,
+                 "Clinic_Tag": clinic_tag, "source_type": "standard"}
+                for month, total, rate in zip(pd.DatetimeIndex(months[keep]), totals.tolist(), per_fte.tolist())]
+
+    def parse_app_cpt_data(df, provider_name, log, target_year=None, header_pos=None):
         """
         Parse follow-up CPT codes (99212-99215) from a provider sheet.
         FIX #1 applied: positional column indexing via iloc.
+        header_pos may be passed in when the caller already located the date row.
         """
-        records    = []
-        header_pos = find_date_row(df)
-        ncols      = len(df.columns)
+        records   = []
+        cells     = sheet_cells(df)
+        col0      = [str(v).strip() for v in cells[:, 0]]
+        cpt_rows  = {code: next((r for r, v in enumerate(col0) if v.startswith(code)), -1)
+                     for code in APP_CPT_RATES}
+        if all(r == -1 for r in cpt_rows.values()):
+            return records
+
+        # Resolve the month header once for every CPT row
+        if header_pos is None:
+            header_pos = find_date_row(cells)
+        header = cells[header_pos]
+        months = []
+        for col_pos in range(4, len(header)):
+            dt_clean = standardize_date(header[col_pos])
+            if pd.isna(dt_clean):
+                continue
+            if target_year and dt_clean.year != target_year:
+                continue
+            months.append((col_pos, dt_clean))
 
         for cpt_code, rate in APP_CPT_RATES.items():
-            cpt_row_pos = -1
-            for r in range(len(df)):
-                if str(df.iloc[r, 0]).strip().startswith(cpt_code):
-                    cpt_row_pos = r
-                    break
+            cpt_row_pos = cpt_rows[cpt_code]
             if cpt_row_pos == -1:
                 continue
-
-            # FIX #1: iterate positionally
-            for col_pos in range(4, ncols):
-                dt_clean = standardize_date(df.iloc[header_pos, col_pos])
-                if pd.isna(dt_clean):
-                    continue
-                if target_year and dt_clean.year != target_year:
-                    continue
-                val = clean_number(df.iloc[cpt_row_pos, col_pos])
+            row = cells[cpt_row_pos]
+            for col_pos, dt_clean in months:
+                val = clean_number(row[col_pos])
                 if val is not None and val != 0:
                     records.append({
                         "Name":        provider_name,
@@ -549,7 +749,7 @@ if check_password():
                         "CPT Code":    cpt_code,
                         "Rate":        rate,
                     })
-        return pd.DataFrame(records)
+        return records
 
     def parse_consults_data(df, sheet_name, log, target_year=None):
         """
@@ -562,31 +762,29 @@ if check_password():
             conv = get_consult_conv(target_year)
 
             # Find the 77263 row
-            col0 = df.iloc[:, 0].astype(str).str.strip()
-            cpt_matches = df.index[col0.str.contains("77263", na=False)].tolist()
-            if not cpt_matches:
-                return pd.DataFrame()
-            cpt_row_pos = cpt_matches[0]
+            cells = sheet_cells(df)   # fixed layout: read cells positionally
+            cpt_row_pos = next((r for r, v in enumerate(cells[:, 0]) if "77263" in str(v)), None)
+            if cpt_row_pos is None:
+                return []
 
             # Find date header row (checking rows 0 and 1)
             header_pos = 1
             for r_idx in [0, 1]:
-                sample = df.iloc[r_idx, 4:10].astype(str).str.upper().tolist()
-                if any(re.search(r'[A-Z]{3}-\d{2}', v) for v in sample):
+                if any(MON_YY_RE.search(str(v).upper()) for v in cells[r_idx, 4:10]):
                     header_pos = r_idx
                     break
 
-            ncols = len(df.columns)
-            for col_pos in range(4, ncols):
-                header_val = str(df.iloc[header_pos, col_pos]).strip()
-                if not re.search(r'^[A-Za-z]{3}-\d{2}$', header_val):
+            header, cpt_row = cells[header_pos], cells[cpt_row_pos]
+            for col_pos in range(4, len(header)):
+                header_val = str(header[col_pos]).strip()
+                if not MON_YY_RE.fullmatch(header_val):
                     continue
                 dt_clean = standardize_date(header_val)
                 if pd.isna(dt_clean):
                     continue
                 if target_year and dt_clean.year != target_year:
                     continue
-                raw_val = clean_number(df.iloc[cpt_row_pos, col_pos])
+                raw_val = clean_number(cpt_row[col_pos])
                 if raw_val is not None and raw_val > 0:
                     records.append({
                         "Name":        sheet_name,
@@ -595,35 +793,34 @@ if check_password():
                     })
         except Exception as e:
             log.append(f"Error parsing 77263 for {sheet_name}: {e}")
-        return pd.DataFrame(records)
+        return records
 
     def parse_77470_data(df, sheet_name, log, target_year=None):
         """Parse CPT 77470 from a provider sheet; divide raw wRVU by CPT_77470_WRVU to get count."""
         SKIP_KEYWORDS = ["YTD", "12 MONTH", "12M", "AVG", "AVERAGE"]
         records = []
         try:
-            col0 = df.iloc[:, 0].astype(str).str.strip()
-            cpt_matches = df.index[col0.str.contains("77470", na=False)].tolist()
-            if not cpt_matches:
-                return pd.DataFrame()
-            cpt_row_pos = cpt_matches[0]
+            cells = sheet_cells(df)   # fixed layout: read cells positionally
+            cpt_row_pos = next((r for r, v in enumerate(cells[:, 0]) if "77470" in str(v)), None)
+            if cpt_row_pos is None:
+                return []
 
             # Detect date header row — handles both string ("Jan-26") and
             # datetime objects (Excel date cells read as datetime by xlrd).
             header_pos = 1
             for r_idx in [0, 1]:
-                raw_row = df.iloc[r_idx, 2:14].tolist()
-                has_text_dt = any(re.search(r'[A-Za-z]{3}-\d{2}', str(v)) for v in raw_row)
-                has_obj_dt  = any(isinstance(v, (datetime, pd.Timestamp)) for v in raw_row)
+                raw_row = cells[r_idx, 2:14]
+                has_text_dt = any(MON_YY_RE.search(str(v)) for v in raw_row)
+                has_obj_dt  = any(isinstance(v, DATE_TYPES) for v in raw_row)
                 if has_text_dt or has_obj_dt:
                     header_pos = r_idx
                     break
 
             # Walk every column; use standardize_date to handle string OR
             # datetime header values uniformly.
-            ncols = len(df.columns)
-            for col_pos in range(2, ncols):
-                raw_hdr = df.iloc[header_pos, col_pos]
+            header, cpt_row = cells[header_pos], cells[cpt_row_pos]
+            for col_pos in range(2, len(header)):
+                raw_hdr = header[col_pos]
                 hdr_str = str(raw_hdr).strip().upper()
                 if any(kw in hdr_str for kw in SKIP_KEYWORDS):
                     continue
@@ -632,7 +829,7 @@ if check_password():
                     continue
                 if target_year and dt_clean.year != target_year:
                     continue
-                raw_val = clean_number(df.iloc[cpt_row_pos, col_pos])
+                raw_val = clean_number(cpt_row[col_pos])
                 if raw_val is not None and raw_val > 0:
                     records.append({
                         "Name":        sheet_name,
@@ -641,7 +838,7 @@ if check_password():
                     })
         except Exception as e:
             log.append(f"Error parsing 77470 for {sheet_name}: {e}")
-        return pd.DataFrame(records)
+        return records
 
     def parse_detailed_prov_sheet(df, filename_date, clinic_id, log, target_year=None):
         """
@@ -676,7 +873,7 @@ if check_password():
           3. When a new provider starts (or EOF), flush accumulated monthly totals
              as individual records (one per month column with non-zero value).
         """
-        records = []
+        records = []   # one provider-month record per non-zero month
         TARGET_TERMS = ["E&M OFFICE CODES", "RADIATION CODES", "SPECIAL PROCEDURES"]
 
         # ── Step 1: Find the date header row and build date_map ──────────────
@@ -685,9 +882,10 @@ if check_password():
 
         date_map    = {}   # col_pos → Timestamp  (monthly actuals only)
         header_row  = -1
+        cells       = df.to_numpy(dtype=object)   # whole sheet, read row-wise below
 
         for r in range(min(10, len(df))):
-            row = df.iloc[r].values
+            row = cells[r]
             tmp = {}
             for c_pos in range(len(row)):
                 cell = str(row[c_pos]).strip()
@@ -698,8 +896,7 @@ if check_password():
                 if any(kw in cell.upper() for kw in SKIP_KEYWORDS):
                     continue
                 # Check for Mon-YY pattern
-                if re.match(r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-\d{2}$',
-                            cell, re.IGNORECASE):
+                if MONTH_YY_RE.fullmatch(cell):
                     dt = standardize_date(cell)
                     if pd.notna(dt):
                         if target_year and dt.year != target_year:
@@ -714,7 +911,7 @@ if check_password():
             # Fallback: use filename date and column 19
             file_dt = standardize_date(filename_date)
             if target_year and pd.notna(file_dt) and file_dt.year != target_year:
-                return pd.DataFrame()
+                return []
             date_map = {19: file_dt}
 
         # ── Step 2: Walk rows ────────────────────────────────────────────────
@@ -729,19 +926,13 @@ if check_password():
                 total = monthly_accum.get(col_pos, 0.0)
                 if total != 0.0:
                     records.append({
-                        "Type":        "provider",
-                        "ID":          clinic_id,
-                        "Name":        current_provider,
-                        "FTE":         1.0,
-                        "Month_Clean": dt,
-                        "Total RVUs":  total,
-                        "RVU per FTE": total,
-                        "Clinic_Tag":  clinic_id,
-                        "source_type": "detail",
+                        "Type": "provider", "ID": clinic_id, "Name": current_provider, "FTE": 1.0,
+                        "Month_Clean": dt, "Total RVUs": total, "RVU per FTE": total,
+                        "Clinic_Tag": clinic_id, "source_type": "detail",
                     })
 
         for i in range(len(df)):
-            row       = df.iloc[i].values
+            row       = cells[i]
             row_label = str(row[0]).upper().strip()
 
             if i == header_row:
@@ -796,16 +987,17 @@ if check_password():
             # 3rd+ occurrence = shouldn't happen but skip anyway
 
         flush_provider()
-        return pd.DataFrame(records)
+        return records
 
     def parse_visits_sheet(df, filename_date, clinic_tag="General", target_year=None):
         records = []
         file_dt = standardize_date(filename_date)
         if target_year and pd.notna(file_dt) and file_dt.year != target_year:
-            return pd.DataFrame()
+            return []
         try:
+            cells = df.to_numpy(dtype=object)
             for i in range(4, len(df)):
-                row = df.iloc[i].values
+                row = cells[i]
                 row_check = " ".join(str(x).upper() for x in row[:5])
                 if any(kw in row_check for kw in ("TOTAL", "PAGE", "DATE")):
                     continue
@@ -838,15 +1030,16 @@ if check_password():
                     "Clinic_Tag":   clinic_tag,
                 })
         except Exception:
-            return pd.DataFrame()
-        return pd.DataFrame(records)
+            return []
+        return records
 
     def parse_financial_sheet(df, filename_date, tag, mode="Provider"):
         records = []
         try:
+            cells = sheet_cells(df)
             header_row, col_map = -1, {}
-            for i in range(min(15, len(df))):
-                row_vals = [str(x).upper().strip() for x in df.iloc[i].values]
+            for i in range(min(15, len(cells))):
+                row_vals = [str(x).upper().strip() for x in cells[i]]
                 if mode == "Provider" and "PROVIDER" in row_vals:
                     header_row = i
                     for idx, val in enumerate(row_vals):
@@ -862,10 +1055,10 @@ if check_password():
                         elif "PAYMENTS" in val: col_map['payments'] = idx
                     break
             if header_row == -1 or not col_map:
-                return pd.DataFrame()
+                return []
             file_dt = standardize_date(filename_date)
-            for i in range(header_row + 1, len(df)):
-                row       = df.iloc[i].values
+            for i in range(header_row + 1, len(cells)):
+                row       = cells[i]
                 name_val  = str(row[col_map.get('name', 0)]).strip()
                 if mode == "Clinic":
                     if tag in ["LROC", "TROC", "PROTON"] and "TOTAL" not in name_val.upper():
@@ -898,16 +1091,17 @@ if check_password():
                 })
         except Exception:
             pass
-        return pd.DataFrame(records)
+        return records
 
     def parse_pos_trend_sheet(df, filename, log, target_year=None):
         records = []
         try:
+            cells = df.to_numpy(dtype=object)
             header_row_pos, date_map = -1, {}
             for r in range(min(30, len(df))):
                 tmp = {}
                 for c in range(len(df.columns)):
-                    dt = standardize_date(df.iloc[r, c])
+                    dt = standardize_date(cells[r, c])
                     if pd.notna(dt):
                         tmp[c] = dt
                 if len(tmp) >= 2:
@@ -915,9 +1109,9 @@ if check_password():
                     date_map       = tmp
                     break
             if header_row_pos == -1:
-                return pd.DataFrame()
+                return []
             for i in range(header_row_pos + 1, len(df)):
-                row  = df.iloc[i].values
+                row  = cells[i]
                 c_id = None
                 for col_idx in range(3):
                     if col_idx >= len(row):
@@ -949,7 +1143,7 @@ if check_password():
                                 })
         except Exception as e:
             log.append(f"POS trend error: {e}")
-        return pd.DataFrame(records)
+        return records
 
     def get_clinic_id_from_sheet(sheet_name):
         s = sheet_name.lower().replace(" prov", "").replace(" rad", "").strip()
@@ -974,256 +1168,294 @@ if check_password():
     # ==========================================
     # DEDUPLICATION HELPER
     # ==========================================
+    def month_labels(month_clean):
+        """'%b-%y' labels for a (NaT-free) Month_Clean column, formatted once per distinct month."""
+        codes, months = pd.factorize(month_clean)
+        return pd.Series(pd.DatetimeIndex(months).strftime('%b-%y').take(codes), index=month_clean.index)
+
+    def safe_ratio(num, den):
+        """Elementwise num / den as float, 0 where den is not positive (or missing)."""
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+    def trend_arrows(delta):
+        """'▲' / '▼' / '→' for changes above +2%, below -2%, or in between (NaN → '→')."""
+        delta = np.asarray(delta, dtype=float)
+        return np.select([delta > 0.02, delta < -0.02], ['▲', '▼'], '→')
+
+    def productivity_tier(rvus, p25, p50, p75):
+        """MGMA tier label for each wRVU total against the 25th / 50th / 75th percentile references."""
+        rvus = np.asarray(rvus, dtype=float)
+        return np.select([rvus > p75, rvus > p50, rvus > p25],
+                         ['🥇 Elite (>75th)', '✅ Above Avg (50–75th)', '⚠️ Average (25–50th)'],
+                         '🔴 Below Avg (<25th)')
+
+    def clinic_display_names(tags):
+        """CLINIC_CONFIG display name for each clinic tag; tags without an entry pass through."""
+        tags = tags.astype(object)
+        return tags.map({cid: cfg['name'] for cid, cfg in CLINIC_CONFIG.items()}).fillna(tags)
+
+    def quarter_labels(month_clean):
+        """'Q1 2026'-style labels for a (NaT-free) Month_Clean column, formatted once per distinct month."""
+        codes, months = pd.factorize(month_clean)
+        labels = np.array([f"Q{m.quarter} {m.year}" for m in pd.DatetimeIndex(months)], dtype=object)
+        return pd.Series(labels.take(codes), index=month_clean.index)
+
+    def month_start(col):
+        """standardize_date over a column; datetime64 columns are floored to the month in one vectorized pass,
+        anything else is parsed once per distinct value and mapped back."""
+        if pd.api.types.is_datetime64_dtype(col):
+            return pd.Series(col.to_numpy().astype('datetime64[M]').astype(col.dtype), index=col.index)
+        uniq = col.dropna().unique()
+        return col.map(dict(zip(uniq, map(standardize_date, uniq))))
+
+    def clean_months(df):
+        """Month_Clean floored to month start, rows without a usable month dropped."""
+        df['Month_Clean'] = month_start(df['Month_Clean'])
+        return df.dropna(subset=['Month_Clean'])
+
+    def add_period_labels(df):
+        """Month_Label and (unless already present) Quarter columns from a NaT-free Month_Clean."""
+        df['Month_Label'] = month_labels(df['Month_Clean'])
+        if 'Quarter' not in df.columns:
+            df['Quarter'] = quarter_labels(df['Month_Clean'])
+        return df
+
+    def as_category(df, cols):
+        """Store low-cardinality tag columns as category (only ever compared with == / isin downstream)."""
+        return df.astype({c: 'category' for c in cols if c in df.columns})
+
     def safe_dedup_and_format(df_list, subset_cols):
         if not df_list:
             return pd.DataFrame()
         df = pd.concat(df_list, ignore_index=True)
         if 'Month_Clean' in df.columns:
-            df['Month_Clean'] = df['Month_Clean'].apply(standardize_date)
-            df = df.dropna(subset=['Month_Clean'])
-            df = df.sort_values('Month_Clean', ascending=False)
+            df = clean_months(df).sort_values('Month_Clean', ascending=False)
         valid_subset = [c for c in subset_cols if c in df.columns]
         if valid_subset:
             df = df.drop_duplicates(subset=valid_subset, keep='first')
         if not df.empty and 'Month_Clean' in df.columns:
-            df['Month_Label'] = df['Month_Clean'].dt.strftime('%b-%y')
-            if 'Quarter' not in df.columns:
-                df['Quarter'] = df['Month_Clean'].apply(lambda x: f"Q{x.quarter} {x.year}")
+            df = add_period_labels(df)
         return df
 
     # ==========================================
     # FILE PROCESSING
     # ==========================================
-    def process_files(file_objects):
-        # Walk server folder if using LocalFile objects
-        if file_objects and isinstance(file_objects[0], LocalFile):
-            all_paths = sorted([
-                os.path.join(root, f)
-                for root, _, files in os.walk(SERVER_DIR)
-                for f in files if f.endswith((".xlsx", ".xls"))
-            ])
-            all_files_to_process = [LocalFile(p) for p in all_paths]
-        else:
-            all_files_to_process = file_objects
-
-        clinic_data = []; provider_data = []; visit_data = []
-        financial_data = []; pos_trend_data = []; consult_data = []
-        app_cpt_data = []; md_cpt_data = []; md_consult_data = []; md_77470_data = []
-        debug_log = []; consult_log = []; prov_log = []
-
-        for file_obj in all_files_to_process:
-            if isinstance(file_obj, LocalFile):
-                filename  = file_obj.name
-                full_path = file_obj.path
-                xls       = pd.read_excel(file_obj.path, sheet_name=None, header=None)
-            else:
-                filename  = file_obj.name.upper()
-                full_path = filename
-                xls       = pd.read_excel(file_obj, sheet_name=None, header=None)
-
-            target_year = get_target_year_from_text(full_path)
-            is_cpa = ("CPA" in full_path.upper().split(os.sep)) or ("CPA" in filename)
-            if is_cpa:
-                target_year = None
-
-            file_date = get_date_from_filename(filename)
-            file_tag  = "General"
-            if "LROC"  in filename: file_tag = "LROC"
-            elif "TROC" in filename: file_tag = "TROC"
-            elif "PROTON" in filename or "TOPC" in filename: file_tag = "TOPC"
-
-            # --- CPA FILES ---
-            if is_cpa:
-                for sheet_name, df in xls.items():
-                    if "RAD BY PROVIDER" in filename:
-                        res = parse_financial_sheet(df, file_date, "RAD", mode="Provider")
-                        if not res.empty: financial_data.append(res)
-                    elif "PROTON" in filename and "PROVIDER" in filename:
-                        res = parse_financial_sheet(df, file_date, "PROTON", mode="Provider")
-                        if not res.empty: financial_data.append(res)
-                        try:
-                            total_row = df[df.iloc[:, 1].astype(str).str.contains("Total", case=False, na=False)]
-                            if not total_row.empty:
-                                chg = clean_number(total_row.iloc[0, 2])
-                                pay = clean_number(total_row.iloc[0, 3])
-                                financial_data.append(pd.DataFrame([{
-                                    "Name": "TN Proton Center", "Month_Clean": standardize_date(file_date),
-                                    "Charges": chg, "Payments": pay, "Tag": "PROTON", "Mode": "Clinic"
-                                }]))
-                        except Exception:
-                            pass
-                    elif "LROC" in filename and "PROVIDER" in filename:
-                        res = parse_financial_sheet(df, file_date, "LROC", mode="Provider")
-                        if not res.empty: financial_data.append(res)
-                    elif "RAD CPA BY CLINIC" in filename:
-                        res = parse_financial_sheet(df, file_date, "General", mode="Clinic")
-                        if not res.empty: financial_data.append(res)
-                    elif "LROC" in filename and "CLINIC" in filename:
-                        res = parse_financial_sheet(df, file_date, "LROC", mode="Clinic")
-                        if not res.empty: financial_data.append(res)
-                    elif "TROC" in filename and "CLINIC" in filename:
-                        res = parse_financial_sheet(df, file_date, "TROC", mode="Clinic")
-                        if not res.empty: financial_data.append(res)
-                continue
+    WORKBOOK_RESULT_KEYS = (
+        "clinic_data", "provider_data", "visit_data", "financial_data", "pos_trend_data",
+        "consult_data", "app_cpt_data", "md_cpt_data", "md_consult_data", "md_77470_data",
+        "scan_77470_data", "debug_log", "consult_log", "scan_consult_log", "prov_log", "scan_77470_log",
+    )
 
-            # --- NEW PATIENT FILES ---
-            if "NEW" in filename and ("PATIENT" in filename or "PT" in filename):
-                file_date = get_date_from_filename(filename)
-                debug_log.append(f"📂 New Patient File: {filename}")
-                found_pos = False
-                for sheet_name, df in xls.items():
-                    if "POS" in sheet_name.upper() and "TREND" in sheet_name.upper():
-                        found_pos = True
-                        res = parse_pos_trend_sheet(df, filename, debug_log, target_year)
-                        if not res.empty:
-                            pos_trend_data.append(res)
-                visit_tag = "LROC" if "LROC" in filename else ("TROC" if "TROC" in filename else ("TOPC" if "PROTON" in filename else "General"))
-                for sheet_name, df in xls.items():
-                    if "PHYS YTD OV" in sheet_name.upper():
-                        res = parse_visits_sheet(df, file_date, clinic_tag=visit_tag, target_year=target_year)
-                        if not res.empty: visit_data.append(res)
-                continue
+    @st.cache_data(show_spinner=False, max_entries=256)
+    def parse_workbook(filename, full_path, content):
+        """
+        Parse one workbook into lists of frames / log lines keyed by WORKBOOK_RESULT_KEYS.
+        content is the upload's bytes, or a server file's stat key (read from full_path here).
+        Cached per workbook, so adding or replacing one file re-parses only that file
+        when process_files misses. No Streamlit UI calls, so it can run on worker threads.
+        """
+        data = content if isinstance(content, bytes) else LocalFile(full_path).getvalue()
+        results = {key: [] for key in WORKBOOK_RESULT_KEYS}
+        (clinic_data, provider_data, visit_data, financial_data, pos_trend_data,
+         consult_data, app_cpt_data, md_cpt_data, md_consult_data, md_77470_data,
+         scan_77470_data, debug_log, consult_log, scan_consult_log, prov_log,
+         scan_77470_log) = results.values()
+
+        target_year = get_target_year_from_text(full_path)
+        is_cpa = ("CPA" in full_path.upper().split(os.sep)) or ("CPA" in filename)
+        if is_cpa:
+            target_year = None
+        is_new_patient = "NEW" in filename and ("PATIENT" in filename or "PT" in filename)
+
+        file_date = get_date_from_filename(filename)
+        file_tag  = "General"
+        if "LROC"  in filename: file_tag = "LROC"
+        elif "TROC" in filename: file_tag = "TROC"
+        elif "PROTON" in filename or "TOPC" in filename: file_tag = "TOPC"
+
+        # --- CPA FILES ---
+        # The CPA layout is chosen by filename alone, so settle it before opening
+        # the workbook and skip the read entirely for unrecognised CPA exports.
+        if is_cpa:
+            if "RAD BY PROVIDER" in filename:                      cpa_tag, cpa_mode = "RAD", "Provider"
+            elif "PROTON" in filename and "PROVIDER" in filename:  cpa_tag, cpa_mode = "PROTON", "Provider"
+            elif "LROC" in filename and "PROVIDER" in filename:    cpa_tag, cpa_mode = "LROC", "Provider"
+            elif "RAD CPA BY CLINIC" in filename:                  cpa_tag, cpa_mode = "General", "Clinic"
+            elif "LROC" in filename and "CLINIC" in filename:      cpa_tag, cpa_mode = "LROC", "Clinic"
+            elif "TROC" in filename and "CLINIC" in filename:      cpa_tag, cpa_mode = "TROC", "Clinic"
+            else:
+                return results
 
-            # --- STANDARD RVU/PROVIDER FILES ---
+            for sheet_name, df in read_workbook(io.BytesIO(data)).items():
+                cells = sheet_cells(df)
+                financial_data.extend(parse_financial_sheet(cells, file_date, cpa_tag, mode=cpa_mode))
+                if cpa_tag == "PROTON":
+                    try:
+                        total_pos = next((r for r, v in enumerate(cells[:, 1]) if "TOTAL" in str(v).upper()), None)
+                        if total_pos is not None:
+                            chg = clean_number(cells[total_pos, 2])
+                            pay = clean_number(cells[total_pos, 3])
+                            financial_data.append({
+                                "Name": "TN Proton Center", "Month_Clean": standardize_date(file_date),
+                                "Charges": chg, "Payments": pay, "Tag": "PROTON", "Mode": "Clinic"
+                            })
+                    except Exception:
+                        pass
+            return results
+
+        file_kind = "new_patient" if is_new_patient else "standard"
+        xls = read_workbook(io.BytesIO(data), keep=lambda sn: wanted_sheet(sn, file_kind, file_tag))
+
+        # --- NEW PATIENT FILES ---
+        if is_new_patient:
+            debug_log.append(f"📂 New Patient File: {filename}")
+            visit_tag = "LROC" if "LROC" in filename else ("TROC" if "TROC" in filename else ("TOPC" if "PROTON" in filename else "General"))
+            # xls only holds the POS trend and PHYS YTD OV tabs (see wanted_sheet);
+            # trend rows are collected first, as before, then the visit rows.
+            visit_sheets = []
             for sheet_name, df in xls.items():
-                s_upper = sheet_name.upper()
-                s_lower = sheet_name.strip().lower()
-                clean_name = sheet_name.strip()
-
-                # Skip trend sheets that aren't productivity trends
-                # Exception: bare "Trend" sheet in LROC/TROC 2026 files is the productivity data
-                if "TREND" in s_upper and "PRODUCTIVITY TREND" not in s_upper:
-                    if not (s_upper == "TREND" and file_tag in ["LROC", "TROC"]):
-                        continue
+                s_upper = classify_sheet(sheet_name)[1]
+                if "POS" in s_upper and "TREND" in s_upper:
+                    pos_trend_data.extend(parse_pos_trend_sheet(df, filename, debug_log, target_year))
+                if "PHYS YTD OV" in s_upper:
+                    visit_sheets.append(df)
+            for df in visit_sheets:
+                visit_data.extend(parse_visits_sheet(df, file_date, clinic_tag=visit_tag, target_year=target_year))
+            return results
+
+        # --- STANDARD RVU/PROVIDER FILES ---
+        proton_prov_temp = []   # TOPC provider records, reused for the clinic roll-up
+        for sheet_name, df in xls.items():
+            # Non-productivity trend tabs were already dropped by wanted_sheet at read time
+            clean_name, s_upper, match_prov, is_detail, is_ignored, rvu_name = classify_sheet(sheet_name)
+            cells = sheet_cells(df)   # one object array shared by the positional parsers below
+
+            # Check if the sheet name is itself a provider name
+            # (its date row is located once, for both the CPT and RVU parsers)
+            header_pos = find_date_row(cells) if match_prov else None
+            if match_prov:
+                if match_prov in APP_SET:
+                    app_cpt_data.extend(parse_app_cpt_data(cells, match_prov, prov_log, target_year, header_pos))
+                else:
+                    md_cpt_data.extend(parse_app_cpt_data(cells, match_prov, prov_log, target_year, header_pos))
+                    md_consult_data.extend(parse_consults_data(cells, match_prov, consult_log, target_year))
+                    md_77470_data.extend(parse_77470_data(cells, match_prov, consult_log, target_year))
 
-                # Check if the sheet name is itself a provider name
-                match_prov = match_provider(clean_name)
-                if match_prov:
-                    if match_prov in APP_LIST:
-                        res = parse_app_cpt_data(df, match_prov, prov_log, target_year)
-                        if not res.empty: app_cpt_data.append(res)
-                    else:
-                        res_cpt = parse_app_cpt_data(df, match_prov, prov_log, target_year)
-                        if not res_cpt.empty: md_cpt_data.append(res_cpt)
-                        res_77263 = parse_consults_data(df, match_prov, consult_log, target_year)
-                        if not res_77263.empty: md_consult_data.append(res_77263)
-                        res_77470 = parse_77470_data(df, match_prov, consult_log, target_year)
-                        if not res_77470.empty: md_77470_data.append(res_77470)
-
-                # Clinic-level detail sheets (e.g. "Centennial Prov")
-                if s_lower.endswith(" prov"):
-                    c_id = get_clinic_id_from_sheet(sheet_name)
-                    if c_id:
-                        res = parse_detailed_prov_sheet(df, file_date, c_id, prov_log, target_year)
-                        if not res.empty: provider_data.append(res)
-                    elif "sumner" in s_lower:
-                        res = parse_detailed_prov_sheet(df, file_date, "Sumner", prov_log, target_year)
-                        if not res.empty: provider_data.append(res)
-                    continue
+            # Clinic-level detail sheets (e.g. "Centennial Prov")
+            if is_detail:
+                c_id = get_clinic_id_from_sheet(sheet_name)
+                if c_id:
+                    provider_data.extend(parse_detailed_prov_sheet(df, file_date, c_id, prov_log, target_year))
+                elif "SUMNER" in s_upper:
+                    provider_data.extend(parse_detailed_prov_sheet(df, file_date, "Sumner", prov_log, target_year))
+                continue
 
-                if any(ign in s_upper for ign in IGNORED_SHEETS):
-                    continue
+            if is_ignored:
+                continue
 
-                # Clinic-level sheets (sheet name matches a clinic ID)
-                if clean_name in CLINIC_CONFIG:
-                    res = parse_rvu_sheet(df, clean_name, 'clinic', clinic_tag="General", target_year=target_year)
-                    if not res.empty: clinic_data.append(res)
-                    pretty_name = CLINIC_CONFIG[clean_name]["name"]
-                    res_consult = parse_consults_data(df, pretty_name, consult_log, target_year)
-                    if not res_consult.empty: consult_data.append(res_consult)
-                    # Fall through to also extract any provider rows below
-
-                if "PRODUCTIVITY TREND" in s_upper or (s_upper == "TREND" and file_tag in ["LROC", "TROC"]):
-                    if file_tag in ["LROC", "TROC"]:
-                        res = parse_rvu_sheet(df, file_tag, 'clinic', clinic_tag=file_tag, target_year=target_year)
-                        if not res.empty: clinic_data.append(res)
-                        pretty_name = CLINIC_CONFIG[file_tag]["name"]
-                        res_consult = parse_consults_data(df, pretty_name, consult_log, target_year)
-                        if not res_consult.empty: consult_data.append(res_consult)
-                    continue
+            # Clinic-level sheets (sheet name matches a clinic ID)
+            if clean_name in CLINIC_CONFIG:
+                clinic_data.extend(parse_rvu_sheet(cells, clean_name, 'clinic', clinic_tag="General", target_year=target_year))
+                pretty_name = CLINIC_CONFIG[clean_name]["name"]
+                consult_data.extend(parse_consults_data(cells, pretty_name, consult_log, target_year))
+                # Fall through to also extract any provider rows below
+
+            if "PRODUCTIVITY TREND" in s_upper or (s_upper == "TREND" and file_tag in ["LROC", "TROC"]):
+                if file_tag in ["LROC", "TROC"]:
+                    clinic_data.extend(parse_rvu_sheet(cells, file_tag, 'clinic', clinic_tag=file_tag, target_year=target_year))
+                    pretty_name = CLINIC_CONFIG[file_tag]["name"]
+                    consult_data.extend(parse_consults_data(cells, pretty_name, consult_log, target_year))
+                continue
 
-                if "PROTON" in s_upper and file_tag == "TOPC":
-                    continue
-                if "PROTON POS" in s_upper:
-                    continue
-                if clean_name.upper() == "FRIEDMEN":
-                    clean_name = "Friedman"
-
-                # Provider-level sheets
-                res = parse_rvu_sheet(df, clean_name, 'provider', clinic_tag=file_tag, target_year=target_year)
-                if not res.empty:
-                    provider_data.append(res)
-                    prov_log.append(f"  ✅ {clean_name} ({len(res)} rows)")
-
-            # Build TOPC clinic roll-up from individual proton provider sheets
-            if file_tag == "TOPC":
-                proton_prov_temp = []
-                for sheet_name, df in xls.items():
-                    s_upper = sheet_name.upper()
-                    if "PROV" in s_upper: continue
-                    if any(ign in s_upper for ign in IGNORED_SHEETS): continue
-                    if "PROTON POS" in s_upper or "TREND" in s_upper: continue
-                    cn = sheet_name.strip()
-                    if cn.upper() == "FRIEDMEN": cn = "Friedman"
-                    res = parse_rvu_sheet(df, cn, 'provider', clinic_tag="TOPC", target_year=target_year)
-                    if not res.empty: proton_prov_temp.append(res)
-                if proton_prov_temp:
-                    comb = pd.concat(proton_prov_temp)
-                    comb['Month_Clean'] = pd.to_datetime(comb['Month_Clean'], errors='coerce')
-                    grp = comb.groupby('Month_Clean', as_index=False)[['Total RVUs']].sum()
-                    # Use the configured clinic FTE (2.5), not the sum of individual provider FTEs.
-                    topc_fte = CLINIC_CONFIG.get("TOPC", {}).get("fte", 2.5)
-                    topc_records = []
-                    for _, row in grp.iterrows():
-                        topc_records.append({
-                            "Type": "clinic", "ID": "TOPC", "Name": "TN Proton Center",
-                            "FTE": topc_fte, "Month_Clean": row['Month_Clean'],
-                            "Total RVUs": row['Total RVUs'],
-                            "RVU per FTE": row['Total RVUs'] / topc_fte,
-                            "Clinic_Tag": "TOPC", "source_type": "standard",
-                        })
-                    clinic_data.append(pd.DataFrame(topc_records))
+            if "PROTON" in s_upper and file_tag == "TOPC":
+                continue
+            if "PROTON POS" in s_upper:
+                continue
+
+            # Provider-level sheets
+            res = parse_rvu_sheet(cells, rvu_name, 'provider', clinic_tag=file_tag, target_year=target_year,
+                                  header_pos=header_pos)
+            if res:
+                provider_data.extend(res)
+                prov_log.append(f"  ✅ {rvu_name} ({len(res)} rows)")
+                if file_tag == "TOPC" and "PROV" not in s_upper:
+                    proton_prov_temp.extend(res)
+
+        # Build TOPC clinic roll-up from the proton provider sheets parsed above
+        if proton_prov_temp:
+            # Only the month/RVU fields are needed, so sum those per month
+            totals = (pd.Series([r['Total RVUs'] for r in proton_prov_temp],
+                                index=[r['Month_Clean'] for r in proton_prov_temp])
+                      .groupby(level=0).sum())
+            # Use the configured clinic FTE (2.5), not the sum of individual provider FTEs.
+            topc_fte = CLINIC_CONFIG.get("TOPC", {}).get("fte", 2.5)
+            clinic_data.extend(
+                {"Type": "clinic", "ID": "TOPC", "Name": "TN Proton Center", "FTE": topc_fte,
+                 "Month_Clean": month, "Total RVUs": total, "RVU per FTE": total / topc_fte,
+                 "Clinic_Tag": "TOPC", "source_type": "standard"}
+                for month, total in totals.items())
 
         # --- DEDICATED 77470 SCAN ---
-        # Explicitly walk every sheet in every file, scan column 0 for the
+        # Explicitly walk every sheet in the workbook, scan column 0 for the
         # "77470" row, then read across for the relevant month columns.
-        scan_77470_log = []
-        for file_obj_77 in all_files_to_process:
-            if isinstance(file_obj_77, LocalFile):
-                fn_77 = file_obj_77.name
-                fp_77 = file_obj_77.path
-                yr_77 = get_target_year_from_text(fp_77)
-            else:
-                fn_77 = file_obj_77.name.upper()
-                fp_77 = file_obj_77
-                yr_77 = get_target_year_from_text(fn_77)
-            if ("CPA" in fn_77) or ("NEW" in fn_77 and ("PATIENT" in fn_77 or "PT" in fn_77)):
+        # Non-productivity trend tabs never reach xls (wanted_sheet drops them).
+        for sn_77, sdf_77 in xls.items():
+            _, _, prov_77, _, ignored_77, _ = classify_sheet(sn_77)
+            if ignored_77:
                 continue
-            try:
-                xls_77 = pd.read_excel(fp_77, sheet_name=None, header=None)
-            except Exception as e_77:
-                scan_77470_log.append(f"READ_FAIL {fn_77}: {e_77}")
+            if not prov_77 or prov_77 in APP_SET:
                 continue
-            for sn_77, sdf_77 in xls_77.items():
-                su_77 = sn_77.upper()
-                if "TREND" in su_77 and "PRODUCTIVITY TREND" not in su_77:
-                    continue
-                if any(ign in su_77 for ign in IGNORED_SHEETS):
-                    continue
-                prov_77 = match_provider(sn_77.strip())
-                if not prov_77 or prov_77 in APP_LIST:
-                    continue
-                r_77 = parse_77470_data(sdf_77, prov_77, consult_log, yr_77)
-                if not r_77.empty:
-                    md_77470_data.append(r_77)
-                    scan_77470_log.append(f"OK {fn_77}|{sn_77}: {len(r_77)} records yr={yr_77}")
-                else:
-                    scan_77470_log.append(f"EMPTY {fn_77}|{sn_77} yr={yr_77}")
+            r_77 = parse_77470_data(sdf_77, prov_77, scan_consult_log, target_year)
+            if r_77:
+                scan_77470_data.extend(r_77)
+                scan_77470_log.append(f"OK {filename}|{sn_77}: {len(r_77)} records yr={target_year}")
+            else:
+                scan_77470_log.append(f"EMPTY {filename}|{sn_77} yr={target_year}")
+        return results
+
+    def build_frames(file_payloads):
+        """
+        Parse every workbook into the dashboard frames.
+        file_payloads is a tuple of file_payload() entries (see process_files for caching).
+        Workbooks are parsed in parallel; results are merged in file order.
+        """
+        # The reader and parsers hold the GIL for much of their work, so more
+        # threads than cores only adds switching; one core parses inline.
+        workers = max(1, min(8, len(file_payloads), os.cpu_count() or 1))
+        if workers == 1:
+            parsed = [parse_workbook(*p) for p in file_payloads]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(lambda p: parse_workbook(*p), file_payloads))
+
+        def gather(key):
+            return [item for res in parsed for item in res[key]]
+
+        def gather_records(*keys):
+            """Row records from every workbook built into one DataFrame (as a 0/1-item list)."""
+            rows = [row for key in keys for row in gather(key)]
+            return [pd.DataFrame(rows)] if rows else []
+
+        # Every parser returns row records, so each bucket is built in one shot.
+        clinic_data = gather_records("clinic_data"); provider_data = gather_records("provider_data")
+        visit_data = gather_records("visit_data"); financial_data = gather_records("financial_data")
+        pos_trend_data = gather_records("pos_trend_data"); consult_data = gather_records("consult_data")
+        app_cpt_data = gather_records("app_cpt_data"); md_cpt_data = gather_records("md_cpt_data")
+        md_consult_data = gather_records("md_consult_data")
+        # Dedicated-scan 77470 rows come last so they win the keep='last' dedup
+        md_77470_data = gather_records("md_77470_data", "scan_77470_data")
+        debug_log = gather("debug_log"); prov_log = gather("prov_log")
+        consult_log = gather("consult_log") + gather("scan_consult_log")
+        scan_77470_log = gather("scan_77470_log")
 
         # --- DEDUPLICATION ---
         df_clinic    = safe_dedup_and_format(clinic_data,    ['Name', 'Month_Clean', 'ID'])
-        df_visits    = safe_dedup_and_format(visit_data,     ['Name', 'Month_Clean', 'Clinic_Tag'])
-        df_financial = safe_dedup_and_format(financial_data, ['Name', 'Month_Clean', 'Mode'])
+        df_visits    = as_category(safe_dedup_and_format(visit_data, ['Name', 'Month_Clean', 'Clinic_Tag']),
+                                   ['Clinic_Tag'])
+        df_financial = as_category(safe_dedup_and_format(financial_data, ['Name', 'Month_Clean', 'Mode']),
+                                   ['Mode', 'Tag'])
         df_pos_trend = safe_dedup_and_format(pos_trend_data, ['Clinic_Tag', 'Month_Clean'])
 
         # Provider dedup: detail records (from *Prov sheets) contain per-month
@@ -1231,20 +1463,16 @@ if check_password():
         # We keep the LAST-written value per Name+Month+Clinic_Tag+source_type
         # (ascending sort means later files overwrite earlier ones for the same month).
         if provider_data:
-            all_prov = pd.concat(provider_data, ignore_index=True)
-            all_prov['Month_Clean'] = all_prov['Month_Clean'].apply(standardize_date)
-            all_prov = all_prov.dropna(subset=['Month_Clean'])
-            all_prov['Month_Label'] = all_prov['Month_Clean'].dt.strftime('%b-%y')
-            if 'Quarter' not in all_prov.columns:
-                all_prov['Quarter'] = all_prov['Month_Clean'].apply(
-                    lambda x: f"Q{x.quarter} {x.year}")
+            all_prov = add_period_labels(clean_months(pd.concat(provider_data, ignore_index=True)))
             if 'source_type' not in all_prov.columns:
                 all_prov['source_type'] = 'standard'
             # Sort ascending so later files (e.g. MAR26) come last and win
             all_prov = all_prov.sort_values('Month_Clean', ascending=True)
             all_prov = all_prov.drop_duplicates(
                 subset=['Name', 'Month_Clean', 'Clinic_Tag', 'source_type'], keep='last')
-            df_provider_raw = all_prov
+            # A handful of distinct tags repeated on every row; the tabs only filter
+            # on them with == / isin, which compare category codes instead of strings.
+            df_provider_raw = as_category(all_prov, ['Type', 'Clinic_Tag', 'source_type'])
         else:
             df_provider_raw = pd.DataFrame()
 
@@ -1253,10 +1481,7 @@ if check_password():
             if not data_list:
                 return pd.DataFrame()
             raw = pd.concat(data_list, ignore_index=True)
-            raw = raw.drop_duplicates(subset=['Name', 'Month_Clean'], keep='last')
-            raw['Month_Label'] = raw['Month_Clean'].dt.strftime('%b-%y')
-            raw['Quarter']     = raw['Month_Clean'].apply(lambda x: f"Q{x.quarter} {x.year}")
-            return raw
+            return add_period_labels(raw.drop_duplicates(subset=['Name', 'Month_Clean'], keep='last'))
 
         df_consults     = dedup_consults(consult_data)
         df_md_consults  = dedup_consults(md_consult_data)
@@ -1265,39 +1490,62 @@ if check_password():
         df_md_cpt       = safe_dedup_and_format(md_cpt_data,  ['Name', 'Month_Clean', 'CPT Code'])
 
         if not df_pos_trend.empty:
-            df_pos_trend['Display_Name'] = df_pos_trend['Clinic_Tag'].apply(
-                lambda x: CLINIC_CONFIG.get(x, {}).get('name', x))
+            df_pos_trend['Display_Name'] = clinic_display_names(df_pos_trend['Clinic_Tag'])
 
         if not df_clinic.empty:
-            df_clinic = df_clinic.groupby(
-                ['Name', 'ID', 'Month_Clean', 'Month_Label', 'Quarter'], as_index=False
-            ).agg({'Total RVUs': 'sum', 'FTE': 'max', 'Clinic_Tag': 'first'})
+            # safe_dedup_and_format already left one row per Name/ID/month, so there is
+            # nothing to aggregate: just put the rows in Name/ID/month order.
+            df_clinic = (df_clinic.sort_values(['Name', 'ID', 'Month_Clean'])
+                         [['Name', 'ID', 'Month_Clean', 'Month_Label', 'Quarter', 'Total RVUs', 'FTE', 'Clinic_Tag']]
+                         .reset_index(drop=True))
             # Always use the canonical configured FTE — overrides any summed/wrong values
             # that may have come from individual provider roll-ups (e.g. TOPC).
             clinic_fte_map = {cid: cfg['fte'] for cid, cfg in CLINIC_CONFIG.items()}
             df_clinic['FTE'] = df_clinic['ID'].map(clinic_fte_map).fillna(df_clinic['FTE'])
-            df_clinic['RVU per FTE'] = df_clinic.apply(
-                lambda x: x['Total RVUs'] / x['FTE'] if x['FTE'] > 0 else 0, axis=1)
+            df_clinic['RVU per FTE'] = safe_ratio(df_clinic['Total RVUs'], df_clinic['FTE'])
             df_clinic.sort_values('Month_Clean', inplace=True)
 
         df_provider_global = pd.DataFrame()
         if not df_provider_raw.empty:
             # FIX #2: proper column existence check before filtering on source_type
             if 'source_type' in df_provider_raw.columns:
-                df_md_clean = df_provider_raw[df_provider_raw['source_type'] != 'detail'].copy()
+                df_md_clean = df_provider_raw[df_provider_raw['source_type'] != 'detail']
             else:
-                df_md_clean = df_provider_raw.copy()
+                df_md_clean = df_provider_raw
             df_provider_global = df_md_clean.groupby(
                 ['Name', 'ID', 'Month_Clean', 'Quarter', 'Month_Label'], as_index=False
             ).agg({'Total RVUs': 'sum', 'FTE': 'max'})
-            df_provider_global['RVU per FTE'] = df_provider_global.apply(
-                lambda x: x['Total RVUs'] / x['FTE'] if x['FTE'] > 0 else 0, axis=1)
+            df_provider_global['RVU per FTE'] = safe_ratio(df_provider_global['Total RVUs'], df_provider_global['FTE'])
             df_provider_global.sort_values('Month_Clean', inplace=True)
 
         return (df_clinic, df_provider_global, df_provider_raw, df_visits, df_financial,
                 df_pos_trend, df_consults, df_app_cpt, df_md_cpt, df_md_consults, df_md_77470,
                 debug_log, consult_log, prov_log, scan_77470_log)
 
+    @st.cache_data(show_spinner=False, max_entries=1, persist="disk")
+    def process_server_files(file_payloads):
+        """
+        build_frames for the Reports folder alone, persisted to Streamlit's disk cache so a
+        restarted server reloads the parsed frames instead of re-reading every workbook.
+        Only runs when the folder's files changed, so older disk entries are stale: drop them.
+        """
+        process_server_files.clear()
+        return build_frames(file_payloads)
+
+    @st.cache_data(show_spinner=False, max_entries=8)
+    def process_uploaded_files(file_payloads):
+        """build_frames for a set including temporary uploads; kept in memory only, never on disk."""
+        return build_frames(file_payloads)
+
+    def process_files(file_payloads):
+        """
+        Dashboard frames for file_payloads, cached on each file's (mtime, size) or uploaded bytes.
+        Server-only sets are disk-persisted; any upload keeps the whole result in memory.
+        """
+        if any(isinstance(content, bytes) for _, _, content in file_payloads):
+            return process_uploaded_files(file_payloads)
+        return process_server_files(file_payloads)
+
     # ==========================================
     # NARRATIVE GENERATOR
     # FIX #3: guarded column access, no KeyError on missing RVU per FTE
@@ -1346,7 +1594,7 @@ if check_password():
         df_h = get_historical_df()
         if clinic_filter == "TriStar":        df_h_view = df_h[df_h['ID'].isin(target_ids_tristar)]
         elif clinic_filter == "Ascension":    df_h_view = df_h[df_h['ID'].isin(target_ids_ascension)]
-        elif clinic_filter == "All":          df_h_view = df_h.copy()
+        elif clinic_filter == "All":          df_h_view = df_h
         else:                                 df_h_view = pd.DataFrame()
         if df_h_view.empty:
             return
@@ -1365,7 +1613,7 @@ if check_password():
         df_hist = get_historical_df()
         if clinic_filter == "TriStar":     df_hist_view = df_hist[df_hist['ID'].isin(target_ids_tristar)]
         elif clinic_filter == "Ascension": df_hist_view = df_hist[df_hist['ID'].isin(target_ids_ascension)]
-        elif clinic_filter == "All":       df_hist_view = df_hist.copy()
+        elif clinic_filter == "All":       df_hist_view = df_hist
         elif clinic_filter == "Sumner":    df_hist_view = df_hist[df_hist['ID'] == 'Sumner']
         else:
             target_id = clinic_filter_id_map.get(clinic_filter, clinic_filter)
@@ -1380,13 +1628,12 @@ if check_password():
             if ytd > 0:
                 hist_trend = pd.concat([hist_trend, pd.DataFrame({"Year": [current_year], "Total RVUs": [ytd]})], ignore_index=True)
 
-        fig_long = px.bar(hist_trend, x='Year', y='Total RVUs', text_auto='.2s')
-        st.plotly_chart(style_high_end_chart(fig_long), use_container_width=True,
+        fig_long = cached_chart('bar', hist_trend, x='Year', y='Total RVUs', text_auto='.2s')
+        st.plotly_chart(fig_long, use_container_width=True,
                         key=f"fig_long_{tab_key_suffix}_{clinic_filter}")
 
         if clinic_filter not in ["TriStar", "Ascension", "All"]:
-            ht = hist_trend.copy()
-            ht['Year'] = ht['Year'].astype(int).astype(str)
+            ht = hist_trend.assign(Year=hist_trend['Year'].astype(int).astype(str))
             render_table(ht.set_index('Year').T.style.format("{:,.0f}"))
 
         if clinic_filter in ["TriStar", "Ascension"]:
@@ -1401,24 +1648,20 @@ if check_password():
                     if ytd_c > 0:
                         c_hist = pd.concat([c_hist, pd.DataFrame({"Year": [current_year], "Total RVUs": [ytd_c]})], ignore_index=True)
                 if not c_hist.empty:
-                    fig_c = px.bar(
+                    fig_c = cached_chart('bar',
                         c_hist, x='Year', y='Total RVUs', text_auto='.2s',
                         title=f'{c_name}<br><sup style="color:#64748b;font-size:13px;">Annual wRVU Totals</sup>',
                     )
                     with cols[idx % 2]:
                         st.markdown(f"**{c_name}**")
-                        st.plotly_chart(style_high_end_chart(fig_c), use_container_width=True,
+                        st.plotly_chart(fig_c, use_container_width=True,
                                         key=f"fig_clinic_hist_{tab_key_suffix}_{c_id}")
-                        tbl = c_hist.copy()
-                        tbl['Year'] = tbl['Year'].astype(int).astype(str)
-                        tbl = tbl.rename(columns={'Total RVUs': 'Total wRVUs'})
+                        tbl = (c_hist.assign(Year=c_hist['Year'].astype(int).astype(str))
+                               .rename(columns={'Total RVUs': 'Total wRVUs'}))
                         render_table(tbl.set_index('Year').T.style.format("{:,.0f}"))
-                        _xl_buf = io.BytesIO()
-                        with pd.ExcelWriter(_xl_buf, engine='openpyxl') as _writer:
-                            tbl.to_excel(_writer, index=False, sheet_name='Annual wRVUs')
                         st.download_button(
                             label="⬇ Download Excel",
-                            data=_xl_buf.getvalue(),
+                            data=excel_bytes(tbl, 'Annual wRVUs'),
                             file_name=f"{c_name.replace(' ', '_')}_annual_wRVUs.xlsx",
                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                             key=f"dl_clinic_hist_{tab_key_suffix}_{c_id}",
@@ -1429,11 +1672,11 @@ if check_password():
     # ==========================================
     def render_executive_summary(year, df_clinic_all, df_mds_all, df_visits_all, df_financial):
         prior_year = year - 1
-        df_cur  = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == year].copy()  if not df_clinic_all.empty else pd.DataFrame()
-        df_pri  = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == prior_year].copy() if not df_clinic_all.empty else pd.DataFrame()
-        df_mc   = df_mds_all[df_mds_all['Month_Clean'].dt.year == year].copy()        if not df_mds_all.empty   else pd.DataFrame()
-        df_mp   = df_mds_all[df_mds_all['Month_Clean'].dt.year == prior_year].copy()  if not df_mds_all.empty   else pd.DataFrame()
-        df_vc   = df_visits_all[df_visits_all['Month_Clean'].dt.year == year].copy()  if not df_visits_all.empty else pd.DataFrame()
+        df_cur  = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == year]  if not df_clinic_all.empty else pd.DataFrame()
+        df_pri  = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == prior_year] if not df_clinic_all.empty else pd.DataFrame()
+        df_mc   = df_mds_all[df_mds_all['Month_Clean'].dt.year == year]        if not df_mds_all.empty   else pd.DataFrame()
+        df_mp   = df_mds_all[df_mds_all['Month_Clean'].dt.year == prior_year]  if not df_mds_all.empty   else pd.DataFrame()
+        df_vc   = df_visits_all[df_visits_all['Month_Clean'].dt.year == year]  if not df_visits_all.empty else pd.DataFrame()
 
         cur_months = set(df_cur['Month_Clean'].dt.month.unique()) if not df_cur.empty else set()
         df_pri_cmp = df_pri[df_pri['Month_Clean'].dt.month.isin(cur_months)] if not df_pri.empty else pd.DataFrame()
@@ -1446,7 +1689,7 @@ if check_password():
         md_pri    = df_mp_cmp['Total RVUs'].sum() if not df_mp_cmp.empty else 0
         md_yoy    = (md_ytd - md_pri) / md_pri * 100 if md_pri > 0 else 0
         np_ytd    = df_vc['New Patients'].sum() if not df_vc.empty else 0
-        n_months  = df_cur['Month_Clean'].dt.month.nunique() if not df_cur.empty else 0
+        n_months  = len(cur_months)
         projected = ytd_rvu / n_months * 12 if n_months > 0 else 0
         n_mds     = df_mc['Name'].nunique()     if not df_mc.empty else 0
         n_sites   = df_cur['Name'].nunique()    if not df_cur.empty else 0
@@ -1457,18 +1700,18 @@ if check_password():
         net_rvu_fte   = ytd_rvu / total_fte if total_fte > 0 else 0
         app_ytd       = df_mds_all[
             (df_mds_all['Month_Clean'].dt.year == year) &
-            (df_mds_all['Name'].isin(APP_LIST))
+            (df_mds_all['Name'].isin(APP_SET))
         ]['Total RVUs'].sum() if not df_mds_all.empty else 0
         app_pct       = app_ytd / ytd_rvu * 100 if ytd_rvu > 0 else 0
         md_pct        = md_ytd  / ytd_rvu * 100 if ytd_rvu > 0 else 0
 
         # Automated insight generation
         top_clinic    = df_cur.groupby('Name')['Total RVUs'].sum().idxmax() if not df_cur.empty else "—"
-        top_fte_site  = (df_cur.groupby(['ID','Name'])['Total RVUs'].sum().reset_index()
-                         .assign(FTE=lambda d: d['ID'].map(fte_map_exec).fillna(1.0))
-                         .assign(wRVU_FTE=lambda d: d['Total RVUs'] / d['FTE'])
-                         .sort_values('wRVU_FTE', ascending=False)['Name'].iloc[0]
-                         if not df_cur.empty else "—")
+        top_fte_site  = "—"
+        if not df_cur.empty:
+            site_rvu  = df_cur.groupby(['ID','Name'])['Total RVUs'].sum()
+            site_fte  = site_rvu.index.get_level_values('ID').map(fte_map_exec).fillna(1.0)
+            top_fte_site = site_rvu.index.get_level_values('Name')[np.argmax(site_rvu.to_numpy() / site_fte.to_numpy())]
 
         # Page header
         latest_lbl = df_cur['Month_Clean'].max().strftime('%B %Y') if not df_cur.empty else ""
@@ -1537,11 +1780,11 @@ if check_password():
                 np2.columns = ['m','Total RVUs']; np2['Year'] = str(prior_year)
                 yoy_df = pd.concat([nc, np2]).sort_values('m')
                 yoy_df['Month'] = yoy_df['m'].map(_MN)
-                fig_yoy = px.bar(yoy_df, x='Month', y='Total RVUs', color='Year', barmode='group',
+                fig_yoy = cached_chart('bar', yoy_df, x='Month', y='Total RVUs', color='Year', barmode='group',
                                  text_auto='.2s',
                                  color_discrete_map={str(year):'#1E3A8A', str(prior_year):'#94a3b8'},
                                  labels={'Total RVUs':'wRVUs'})
-                st.plotly_chart(style_high_end_chart(fig_yoy), use_container_width=True,
+                st.plotly_chart(fig_yoy, use_container_width=True,
                                 key=f"exec_yoy_{year}")
 
         # ---- Multi-Year Trend (CAGR) ----
@@ -1563,12 +1806,12 @@ if check_password():
             last_hist  = hist_df[hist_df['Type']=='Historical']['Total RVUs'].iloc[-1]
             n_yr       = len(hist_df[hist_df['Type']=='Historical']) - 1
             cagr       = (last_hist / first_val) ** (1 / n_yr) - 1 if n_yr > 0 and first_val > 0 else 0
-            fig_hist = px.bar(hist_df, x='Year', y='Total RVUs',
+            fig_hist = cached_chart('bar', hist_df, x='Year', y='Total RVUs',
                               color='Type', text_auto='.3s',
                               color_discrete_map={'Historical':'#1E3A8A','Projected':'#93c5fd'},
-                              labels={'Total RVUs':'Annual wRVUs'})
-            fig_hist.update_layout(showlegend=True)
-            st.plotly_chart(style_high_end_chart(fig_hist), use_container_width=True,
+                              labels={'Total RVUs':'Annual wRVUs'},
+                              layout=dict(showlegend=True))
+            st.plotly_chart(fig_hist, use_container_width=True,
                             key=f"exec_hist_{year}")
             st.caption(f"CAGR ({hist_years[0]}–{hist_years[-1]}): **{cagr:+.1%}** per year. Projected {year} based on {n_months}-month YTD linear extrapolation.")
 
@@ -1585,10 +1828,9 @@ if check_password():
                 sc['LINACs'] = sc['ID'].map(LINAC_CONFIG)
                 sc['wRVU/LINAC'] = sc['Total RVUs'] / sc['LINACs']   # NaN for TOPC (proton, no LINAC)
                 if not df_pri_cmp.empty:
-                    ps = df_pri_cmp.groupby('ID')['Total RVUs'].sum().reset_index().rename(columns={'Total RVUs':'Prior RVUs'})
-                    sc = sc.merge(ps, on='ID', how='left').fillna({'Prior RVUs': 0})
-                    sc['YoY Δ']  = sc.apply(lambda r: (r['Total RVUs']-r['Prior RVUs'])/r['Prior RVUs'] if r['Prior RVUs']>0 else 0, axis=1)
-                    sc['Trend']  = sc['YoY Δ'].apply(lambda x: '▲' if x>0.02 else ('▼' if x<-0.02 else '→'))
+                    sc['Prior RVUs'] = sc['ID'].map(df_pri_cmp.groupby('ID', sort=False)['Total RVUs'].sum()).fillna(0)
+                    sc['YoY Δ']  = safe_ratio(sc['Total RVUs'] - sc['Prior RVUs'], sc['Prior RVUs'])
+                    sc['Trend']  = trend_arrows(sc['YoY Δ'])
                     disp_cols = ['Name','Total RVUs','% of Network','FTE','wRVU/FTE','wRVU/LINAC','Prior RVUs','YoY Δ','Trend']
                     fmt_sc = {'Total RVUs':'{:,.0f}','% of Network':'{:.1%}','FTE':'{:.1f}',
                               'wRVU/FTE':'{:,.0f}','wRVU/LINAC':'{:,.0f}','Prior RVUs':'{:,.0f}','YoY Δ':'{:+.1%}'}
@@ -1597,7 +1839,7 @@ if check_password():
                     fmt_sc = {'Total RVUs':'{:,.0f}','% of Network':'{:.1%}','FTE':'{:.1f}',
                               'wRVU/FTE':'{:,.0f}','wRVU/LINAC':'{:,.0f}'}
                 sc = sc.sort_values('Total RVUs', ascending=False)
-                sc_disp = sc[disp_cols].copy()
+                sc_disp = sc[disp_cols]
                 sc_disp['% of Network'] = (sc_disp['% of Network'] * 100).round(1)
                 if 'YoY Δ' in sc_disp.columns:
                     sc_disp['YoY Δ'] = (sc_disp['YoY Δ'] * 100).round(1)
@@ -1634,16 +1876,11 @@ if check_password():
                 mgma_25_ytd = MGMA_BENCHMARKS['25th'] / 12 * n_months if n_months > 0 else MGMA_BENCHMARKS['25th']
                 mgma_75_ytd = MGMA_BENCHMARKS['75th'] / 12 * n_months if n_months > 0 else MGMA_BENCHMARKS['75th']
                 msc['vs MGMA 50th'] = msc['Total RVUs'] / mgma_50_ytd - 1
-                msc['Productivity Tier'] = msc['Total RVUs'].apply(
-                    lambda x: '🥇 Elite (>75th)' if x > mgma_75_ytd
-                    else ('✅ Above Avg (50–75th)' if x > mgma_50_ytd
-                    else ('⚠️ Average (25–50th)' if x > mgma_25_ytd
-                    else '🔴 Below Avg (<25th)')))
+                msc['Productivity Tier'] = productivity_tier(msc['Total RVUs'], mgma_25_ytd, mgma_50_ytd, mgma_75_ytd)
                 if not df_mp_cmp.empty:
-                    pm = df_mp_cmp.groupby('Name')['Total RVUs'].sum().reset_index().rename(columns={'Total RVUs':'Prior RVUs'})
-                    msc = msc.merge(pm, on='Name', how='left').fillna({'Prior RVUs':0})
-                    msc['YoY Δ'] = msc.apply(lambda r: (r['Total RVUs']-r['Prior RVUs'])/r['Prior RVUs'] if r['Prior RVUs']>0 else 0, axis=1)
-                    msc['Trend'] = msc['YoY Δ'].apply(lambda x: '▲' if x>0.02 else ('▼' if x<-0.02 else '→'))
+                    msc['Prior RVUs'] = msc['Name'].map(df_mp_cmp.groupby('Name', sort=False)['Total RVUs'].sum()).fillna(0)
+                    msc['YoY Δ'] = safe_ratio(msc['Total RVUs'] - msc['Prior RVUs'], msc['Prior RVUs'])
+                    msc['Trend'] = trend_arrows(msc['YoY Δ'])
                     m_cols = ['Name','Total RVUs','wRVU/FTE','vs MGMA 50th','Productivity Tier','Prior RVUs','YoY Δ','Trend']
                     fmt_m = {'Total RVUs':'{:,.0f}','wRVU/FTE':'{:,.0f}','vs MGMA 50th':'{:+.1%}',
                              'Prior RVUs':'{:,.0f}','YoY Δ':'{:+.1%}'}
@@ -1652,7 +1889,7 @@ if check_password():
                     fmt_m = {'Total RVUs':'{:,.0f}','wRVU/FTE':'{:,.0f}','vs MGMA 50th':'{:+.1%}'}
                 msc = msc.sort_values('Total RVUs', ascending=False)
                 render_table(msc[m_cols].style.format(fmt_m)
-                             .background_gradient(subset=['vs MGMA 50th'], cmap=_LC['RdYlGn']))
+                             .pipe(gradient, 'RdYlGn', subset=['vs MGMA 50th']))
                 elite_n = (msc['Total RVUs'] > mgma_75_ytd).sum()
                 above_n = ((msc['Total RVUs'] > mgma_50_ytd) & (msc['Total RVUs'] <= mgma_75_ytd)).sum()
                 st.caption(
@@ -1678,23 +1915,31 @@ if check_password():
                                       'Prior Year':prior_full,
                                       'Δ vs Prior':( proj_c-prior_full)/prior_full if prior_full>0 else 0})
                 proj_df = pd.DataFrame(proj_rows).sort_values('Projected Annual', ascending=False)
-                fig_proj = px.bar(
+                fig_proj = cached_chart('bar',
                     proj_df.melt(id_vars='Clinic', value_vars=['YTD','Projected Annual']),
                     x='Clinic', y='value', color='variable', barmode='group', text_auto='.2s',
                     color_discrete_sequence=['#1E3A8A','#93c5fd'],
                     labels={'value':'wRVUs','variable':''})
-                st.plotly_chart(style_high_end_chart(fig_proj), use_container_width=True,
+                st.plotly_chart(fig_proj, use_container_width=True,
                                 key=f"exec_proj_{year}")
                 fmt_p = {'YTD':'{:,.0f}','Projected Annual':'{:,.0f}','Proj/FTE':'{:,.0f}',
                          'Prior Year':'{:,.0f}','Δ vs Prior':'{:+.1%}'}
-                _rg = mcolors.LinearSegmentedColormap.from_list('rg_div', ['#dc2626', '#ffffff', '#16a34a'])
                 _delta_abs = proj_df['Δ vs Prior'].abs().max() or 0.01
                 render_table(proj_df.style.format(fmt_p)
-                             .background_gradient(subset=['Projected Annual'], cmap=_LC['Greens'])
-                             .background_gradient(subset=['Δ vs Prior'], cmap=_rg,
-                                                  vmin=-_delta_abs, vmax=_delta_abs))
+                             .pipe(gradient, 'Greens', subset=['Projected Annual'])
+                             .pipe(gradient, 'RdWhGn', subset=['Δ vs Prior'],
+                                   vmin=-_delta_abs, vmax=_delta_abs))
                 st.caption("Δ vs Prior compares projected annual pace against the full prior calendar year — positive values indicate growth trajectory.")
 
+    def pivot_sum(df, index, columns, values):
+        """Sum values into an index x columns grid, zero-filling empty cells."""
+        return df.groupby([index, columns])[values].sum().unstack(fill_value=0)
+
+    def month_order(df):
+        """Month_Label values of df in calendar order, formatted from the distinct months only."""
+        months = pd.DatetimeIndex(df['Month_Clean'].unique()).sort_values()
+        return months.strftime('%b-%y').to_numpy()
+
     def get_most_recent_quarter(df):
         """Return the most recent quarter label present in df, or None."""
         if df.empty or 'Quarter' not in df.columns:
@@ -1715,7 +1960,7 @@ if check_password():
     # FIX #5: source_type filter uses proper column check
     # ==========================================
     def render_clinic_tab(year, df_clinic_all, df_provider_raw, df_pos_trend, df_consults, tab_key_suffix):
-        df_clinic_yr = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == year].copy() if not df_clinic_all.empty else pd.DataFrame()
+        df_clinic_yr = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == year] if not df_clinic_all.empty else pd.DataFrame()
 
         if df_clinic_yr.empty:
             st.info(f"No Clinic data found for {year}.")
@@ -1739,8 +1984,8 @@ if check_password():
             if FPDF:
                 st.markdown("---")
                 with st.expander(f"📄 Export PDF ({year})"):
-                    avail_dates = sorted(df_clinic_yr['Month_Clean'].unique(), reverse=True)
-                    month_opts  = [d.strftime('%b-%y') for d in avail_dates]
+                    avail_dates = pd.DatetimeIndex(df_clinic_yr['Month_Clean'].unique()).sort_values(ascending=False)
+                    month_opts  = tuple(avail_dates.strftime('%b-%y'))
                     sel_month   = st.selectbox("Select Period:", month_opts, key=f"sel_month_{tab_key_suffix}")
                     target_date = pd.to_datetime(sel_month, format='%b-%y')
                     if st.button("Generate PDF Report", key=f"btn_pdf_{tab_key_suffix}"):
@@ -1768,7 +2013,7 @@ if check_password():
         with col_main:
             # Determine filtered view
             if clinic_filter == "All":
-                df_view     = df_clinic_yr.copy()
+                df_view     = df_clinic_yr
                 view_title  = "All Clinics"
                 target_tag  = None
             elif clinic_filter == "TriStar":
@@ -1802,26 +2047,26 @@ if check_password():
                 df_sorted = df_view.sort_values('Month_Clean')
                 if clinic_filter in ["TriStar", "Ascension", "All"]:
                     agg = df_sorted.groupby('Month_Clean')[['Total RVUs']].sum().reset_index()
-                    fig_trend = px.line(agg, x='Month_Clean', y='Total RVUs', markers=True, title="Aggregate Trend")
+                    fig_trend = cached_chart('line', agg, x='Month_Clean', y='Total RVUs', markers=True,
+                                             title="Aggregate Trend")
                 else:
-                    fig_trend = px.line(df_sorted, x='Month_Clean', y='Total RVUs', color='Name', markers=True)
-                st.plotly_chart(style_high_end_chart(fig_trend), use_container_width=True,
+                    fig_trend = cached_chart('line', df_sorted, x='Month_Clean', y='Total RVUs', color='Name', markers=True)
+                st.plotly_chart(fig_trend, use_container_width=True,
                                 key=f"trend_{tab_key_suffix}_{clinic_filter}")
 
             # --- Quarterly bar (single clinics) ---
             if clinic_filter in ["LROC", "TOPC", "TROC", "Sumner"] and not df_view.empty:
                 with st.container(border=True):
                     st.markdown(f"#### 📊 Quarterly wRVU Volume ({view_title})")
-                    dq = df_view.copy()
-                    dq['Q_Sort'] = dq['Month_Clean'].dt.to_period('Q').dt.start_time
+                    dq = df_view.assign(Q_Sort=df_view['Month_Clean'].dt.to_period('Q').dt.start_time)
                     q_agg = dq.groupby(['Quarter', 'Q_Sort'])[['Total RVUs']].sum().reset_index().sort_values('Q_Sort')
                     if len(q_agg) >= 2:
                         last_q, prior_q = q_agg.iloc[-1], q_agg.iloc[-2]
                         pct = ((last_q['Total RVUs'] - prior_q['Total RVUs']) / prior_q['Total RVUs']) * 100
                         st.metric(f"Change: {prior_q['Quarter']} → {last_q['Quarter']}",
                                   f"{last_q['Total RVUs']:,.0f}", f"{pct:+.1f}%")
-                    fig_q = px.bar(q_agg, x='Quarter', y='Total RVUs', text_auto='.2s')
-                    st.plotly_chart(style_high_end_chart(fig_q), use_container_width=True,
+                    fig_q = cached_chart('bar', q_agg, x='Quarter', y='Total RVUs', text_auto='.2s')
+                    st.plotly_chart(fig_q, use_container_width=True,
                                     key=f"qbar_{tab_key_suffix}_{clinic_filter}")
 
             # --- Network peer comparison (LROC / TROC / TOPC) ---
@@ -1881,13 +2126,12 @@ if check_password():
 
                     # New patients/FTE comparison (if visit data available)
                     if not df_pos_trend.empty:
-                        df_pos_cmp = df_pos_trend[df_pos_trend['Month_Clean'].dt.year == year].copy()
+                        df_pos_cmp = df_pos_trend[df_pos_trend['Month_Clean'].dt.year == year]
                         if not df_pos_cmp.empty:
                             np_ytd = (df_pos_cmp.groupby('Clinic_Tag')
                                       .agg(New_Patients=('New Patients', 'sum'))
                                       .reset_index())
-                            np_ytd['Name'] = np_ytd['Clinic_Tag'].apply(
-                                lambda x: CLINIC_CONFIG.get(x, {}).get('name', x))
+                            np_ytd['Name'] = clinic_display_names(np_ytd['Clinic_Tag'])
                             np_ytd['FTE']       = np_ytd['Clinic_Tag'].map(_fte_map).fillna(1.0)
                             np_ytd['NP_per_FTE'] = np_ytd['New_Patients'] / np_ytd['FTE']
                             np_avg  = np_ytd['New_Patients'].sum() / np_ytd['FTE'].sum()
@@ -1926,7 +2170,7 @@ if check_password():
                                               f"{pct_np_avg:+.1f}% (avg: {np_avg:.1f})")
 
                     # wRVU/LINAC comparison (LINAC centers only — excludes TOPC)
-                    linac_cmp = net_ytd[net_ytd['ID'].isin(LINAC_CONFIG)].copy()
+                    linac_cmp = net_ytd[net_ytd['ID'].isin(LINAC_CONFIG)]
                     linac_cmp['LINACs']     = linac_cmp['ID'].map(LINAC_CONFIG)
                     linac_cmp['wRVU_LINAC'] = linac_cmp['Total_RVUs'] / linac_cmp['LINACs']
                     linac_avg = linac_cmp['Total_RVUs'].sum() / linac_cmp['LINACs'].sum()
@@ -1965,7 +2209,7 @@ if check_password():
                             st.metric("LINACs at This Site", int(tgt_linac['LINACs']))
 
                     # Summary comparison table (sortable — all centers + LINAC column where applicable)
-                    net_tbl = net_ytd[['Name','ID','Total_RVUs','FTE','wRVU_FTE']].copy()
+                    net_tbl = net_ytd[['Name','ID','Total_RVUs','FTE','wRVU_FTE']]
                     net_tbl['wRVU/FTE Rank']    = net_tbl['wRVU_FTE'].rank(ascending=False).astype(int)
                     net_tbl['vs. Avg wRVU/FTE'] = (net_tbl['wRVU_FTE'] / net_avg_fte - 1) * 100
                     net_tbl['LINACs']           = net_tbl['ID'].map(LINAC_CONFIG)
@@ -1977,9 +2221,9 @@ if check_password():
                                              'wRVU/FTE Rank','wRVU/LINAC Rank']]
                                     .rename(columns={'Total_RVUs':'Total wRVUs','wRVU_FTE':'wRVU/FTE'}))
                     tbl_styled = (net_tbl_disp.style
-                                  .background_gradient(subset=['wRVU/FTE'],          cmap=_LC['Blues'])
-                                  .background_gradient(subset=['vs. Avg wRVU/FTE'],  cmap=_LC['RdYlGn'])
-                                  .background_gradient(subset=['wRVU/LINAC'],        cmap=_LC['Purples']))
+                                  .pipe(gradient, 'Blues', subset=['wRVU/FTE'])
+                                  .pipe(gradient, 'RdYlGn', subset=['vs. Avg wRVU/FTE'])
+                                  .pipe(gradient, 'Purples', subset=['wRVU/LINAC']))
                     tbl_col_cfg = {
                         "Total wRVUs":       st.column_config.NumberColumn("Total wRVUs",       format="%,.0f"),
                         "FTE":               st.column_config.NumberColumn("FTE",               format="%.1f"),
@@ -1999,8 +2243,8 @@ if check_password():
             if clinic_filter in ["TriStar", "Ascension", "All"]:
                 with st.container(border=True):
                     st.markdown(f"#### 📈 {view_title}: Individual Clinic Trends")
-                    fig_ind = px.line(df_sorted, x='Month_Clean', y='Total RVUs', color='Name', markers=True)
-                    st.plotly_chart(style_high_end_chart(fig_ind), use_container_width=True,
+                    fig_ind = cached_chart('line', df_sorted, x='Month_Clean', y='Total RVUs', color='Name', markers=True)
+                    st.plotly_chart(fig_ind, use_container_width=True,
                                     key=f"ind_{tab_key_suffix}_{clinic_filter}")
 
                     # 77263 table
@@ -2009,12 +2253,12 @@ if check_password():
                         if not df_cons_yr.empty:
                             st.markdown("---")
                             st.markdown("### 📝 Tx Plan Complex (CPT 77263)")
-                            sorted_m = df_cons_yr.sort_values("Month_Clean")["Month_Label"].unique()
-                            piv = df_cons_yr.pivot_table(index="Name", columns="Month_Label", values="Count", aggfunc="sum")
+                            sorted_m = month_order(df_cons_yr)
+                            piv = pivot_sum(df_cons_yr, "Name", "Month_Label", "Count")
                             piv = piv.reindex(columns=sorted_m).fillna(0)
                             piv["Total"] = piv.sum(axis=1)
                             render_table(piv.sort_values("Total", ascending=False).style
-                                         .format("{:,.0f}").background_gradient(cmap=_LC['Blues']))
+                                         .format("{:,.0f}").pipe(gradient, 'Blues'))
 
                     # Historical summary
                     with st.container(border=True):
@@ -2025,36 +2269,32 @@ if check_password():
                     if not df_view.empty:
                         with st.container(border=True):
                             st.markdown("#### 🔢 Monthly Data")
-                            piv_m = df_view.pivot_table(index="Name", columns="Month_Label", values="Total RVUs", aggfunc="sum").fillna(0)
-                            sorted_m2 = df_view.sort_values("Month_Clean")["Month_Label"].unique()
-                            piv_m = piv_m.reindex(columns=sorted_m2).fillna(0)
+                            # One Name x month grid feeds both the monthly and the quarterly table
+                            piv_base = pivot_sum(df_view, "Name", "Month_Clean", "Total RVUs")
+                            piv_m = piv_base.set_axis(
+                                pd.Index(piv_base.columns.strftime('%b-%y'), name="Month_Label"), axis=1)
                             piv_m["Total"] = piv_m.sum(axis=1)
                             render_table(piv_m.sort_values("Total", ascending=False).style
-                                         .format("{:,.0f}").background_gradient(cmap=_LC['Reds']))
-                            _xl_m = io.BytesIO()
-                            with pd.ExcelWriter(_xl_m, engine='openpyxl') as _wr:
-                                piv_m.sort_values("Total", ascending=False).reset_index().to_excel(
-                                    _wr, index=False, sheet_name='Monthly Data')
+                                         .format("{:,.0f}").pipe(gradient, 'Reds'))
                             st.download_button(
                                 label="⬇ Download Excel",
-                                data=_xl_m.getvalue(),
+                                data=excel_bytes(piv_m.sort_values("Total", ascending=False).reset_index(),
+                                                 'Monthly Data'),
                                 file_name=f"{clinic_filter}_monthly_data_{year}.xlsx",
                                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                                 key=f"dl_monthly_{tab_key_suffix}_{clinic_filter}",
                             )
                         with st.container(border=True):
                             st.markdown("#### 📆 Quarterly Data")
-                            piv_q = df_view.pivot_table(index="Name", columns="Quarter", values="Total RVUs", aggfunc="sum").fillna(0)
+                            piv_q = (piv_base.T.groupby(quarter_labels(piv_base.columns.to_series()).to_numpy())
+                                     .sum().T.rename_axis(columns="Quarter"))
                             piv_q["Total"] = piv_q.sum(axis=1)
                             render_table(piv_q.sort_values("Total", ascending=False).style
-                                         .format("{:,.0f}").background_gradient(cmap=_LC['Oranges']))
-                            _xl_q = io.BytesIO()
-                            with pd.ExcelWriter(_xl_q, engine='openpyxl') as _wr:
-                                piv_q.sort_values("Total", ascending=False).reset_index().to_excel(
-                                    _wr, index=False, sheet_name='Quarterly Data')
+                                         .format("{:,.0f}").pipe(gradient, 'Oranges'))
                             st.download_button(
                                 label="⬇ Download Excel",
-                                data=_xl_q.getvalue(),
+                                data=excel_bytes(piv_q.sort_values("Total", ascending=False).reset_index(),
+                                                 'Quarterly Data'),
                                 file_name=f"{clinic_filter}_quarterly_data_{year}.xlsx",
                                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                                 key=f"dl_quarterly_{tab_key_suffix}_{clinic_filter}",
@@ -2064,30 +2304,25 @@ if check_password():
             with st.container(border=True):
                 st.markdown("#### 📅 Monthly wRVU — All Available Months")
                 if clinic_filter == "All":
-                    df_all_m = df_clinic_all.copy()
+                    df_all_m = df_clinic_all
                 elif clinic_filter == "TriStar":
-                    df_all_m = df_clinic_all[df_clinic_all['ID'].isin(TRISTAR_IDS)].copy()
+                    df_all_m = df_clinic_all[df_clinic_all['ID'].isin(TRISTAR_IDS)]
                 elif clinic_filter == "Ascension":
-                    df_all_m = df_clinic_all[df_clinic_all['ID'].isin(ASCENSION_IDS)].copy()
+                    df_all_m = df_clinic_all[df_clinic_all['ID'].isin(ASCENSION_IDS)]
                 else:
                     _fid = filter_id_map.get(clinic_filter, clinic_filter)
-                    df_all_m = df_clinic_all[df_clinic_all['ID'] == _fid].copy()
+                    df_all_m = df_clinic_all[df_clinic_all['ID'] == _fid]
                 if not df_all_m.empty:
-                    _sorted_m = df_all_m.sort_values('Month_Clean')['Month_Label'].unique()
+                    _sorted_m = month_order(df_all_m)
                     piv_all_m = (df_all_m
-                                 .pivot_table(index='Name', columns='Month_Label',
-                                              values='Total RVUs', aggfunc='sum')
-                                 .reindex(columns=_sorted_m)
-                                 .fillna(0))
+                                 .pipe(pivot_sum, 'Name', 'Month_Label', 'Total RVUs')
+                                 .reindex(columns=_sorted_m, fill_value=0))
                     piv_all_m['Total'] = piv_all_m.sum(axis=1)
                     render_table(piv_all_m.sort_values('Total', ascending=False).style
-                                 .format('{:,.0f}').background_gradient(cmap=_LC['Blues']))
-                    _xl_am = io.BytesIO()
-                    with pd.ExcelWriter(_xl_am, engine='openpyxl') as _wr:
-                        piv_all_m.reset_index().to_excel(_wr, index=False, sheet_name='Monthly wRVUs')
+                                 .format('{:,.0f}').pipe(gradient, 'Blues'))
                     st.download_button(
                         label='⬇ Download Excel',
-                        data=_xl_am.getvalue(),
+                        data=excel_bytes(piv_all_m.reset_index(), 'Monthly wRVUs'),
                         file_name=f"{clinic_filter.replace(' ', '_')}_monthly_wRVUs_all_years.xlsx",
                         mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                         key=f'dl_monthly_all_{tab_key_suffix}_{clinic_filter}',
@@ -2105,21 +2340,21 @@ if check_password():
 
             # --- Network-wide new patients (All view) ---
             if clinic_filter == "All":
-                df_pos_yr = df_pos_trend[df_pos_trend['Month_Clean'].dt.year == year].copy() if not df_pos_trend.empty else pd.DataFrame()
+                df_pos_yr = df_pos_trend[df_pos_trend['Month_Clean'].dt.year == year] if not df_pos_trend.empty else pd.DataFrame()
                 if not df_pos_yr.empty:
                     st.markdown("---")
                     st.markdown("### 🆕 Network-Wide New Patients")
                     max_dt = df_pos_yr['Month_Clean'].max()
-                    np_latest = df_pos_yr[df_pos_yr['Month_Clean'] == max_dt].copy()
-                    np_latest['Display_Name'] = np_latest['Clinic_Tag'].apply(lambda x: CLINIC_CONFIG.get(x, {}).get('name', x))
-                    df_pos_yr['Display_Name']  = df_pos_yr['Clinic_Tag'].apply(lambda x: CLINIC_CONFIG.get(x, {}).get('name', x))
-                    fig_np = px.bar(np_latest.sort_values('New Patients', ascending=False),
+                    np_latest = df_pos_yr[df_pos_yr['Month_Clean'] == max_dt]
+                    np_latest['Display_Name'] = clinic_display_names(np_latest['Clinic_Tag'])
+                    df_pos_yr['Display_Name']  = clinic_display_names(df_pos_yr['Clinic_Tag'])
+                    fig_np = cached_chart('bar', np_latest.sort_values('New Patients', ascending=False),
                                     x='Display_Name', y='New Patients', text_auto=True,
                                     title=f"New Patients: {max_dt.strftime('%B %Y')}")
-                    st.plotly_chart(style_high_end_chart(fig_np), use_container_width=True,
+                    st.plotly_chart(fig_np, use_container_width=True,
                                     key=f"np_net_{tab_key_suffix}")
-                    piv_np = df_pos_yr.pivot_table(index="Display_Name", columns="Month_Label", values="New Patients", aggfunc="sum").fillna(0)
-                    render_table(piv_np.style.format("{:,.0f}").background_gradient(cmap=_LC['Greens']))
+                    piv_np = pivot_sum(df_pos_yr, "Display_Name", "Month_Label", "New Patients")
+                    render_table(piv_np.style.format("{:,.0f}").pipe(gradient, 'Greens'))
 
             # --- wRVU/FTE efficiency (All view) ---
             if clinic_filter == "All" and not df_clinic_yr.empty:
@@ -2129,12 +2364,12 @@ if check_password():
                     max_dt_fte = df_clinic_yr['Month_Clean'].max()
                     df_fte_latest = df_clinic_yr[df_clinic_yr['Month_Clean'] == max_dt_fte]
                     if not df_fte_latest.empty:
-                        fig_fte = px.bar(df_fte_latest.sort_values('RVU per FTE', ascending=False),
+                        fig_fte = cached_chart('bar', df_fte_latest.sort_values('RVU per FTE', ascending=False),
                                          x='Name', y='RVU per FTE', text_auto='.0f',
                                          color='RVU per FTE', color_continuous_scale=[[0,'#bfdbfe'],[1,'#1E3A8A']],
-                                         title=f"wRVU per FTE: {max_dt_fte.strftime('%B %Y')}")
-                        fig_fte.update_layout(coloraxis_showscale=False)
-                        st.plotly_chart(style_high_end_chart(fig_fte), use_container_width=True,
+                                         title=f"wRVU per FTE: {max_dt_fte.strftime('%B %Y')}",
+                                         layout=dict(coloraxis_showscale=False))
+                        st.plotly_chart(fig_fte, use_container_width=True,
                                         key=f"fte_{tab_key_suffix}")
                         div_avg = df_fte_latest['Total RVUs'].sum() / df_fte_latest['FTE'].sum() if df_fte_latest['FTE'].sum() > 0 else 0
                         st.caption(f"**Division Average:** {div_avg:,.0f} wRVU/FTE")
@@ -2169,7 +2404,7 @@ if check_password():
             if clinic_filter == "All" and not df_clinic_yr.empty:
                 target_q = get_most_recent_quarter(df_clinic_yr)   # Was hardcoded "Q1 2026"
                 if target_q:
-                    df_q_data = df_clinic_yr[df_clinic_yr['Quarter'] == target_q].copy()
+                    df_q_data = df_clinic_yr[df_clinic_yr['Quarter'] == target_q]
                     if not df_q_data.empty:
                         st.markdown("---")
                         with st.container(border=True):
@@ -2177,12 +2412,12 @@ if check_password():
                             df_q_sum = df_q_data.groupby('ID').agg(
                                 {'Total RVUs': 'sum', 'Name': 'first'}
                             ).reset_index()
-                            fig_qv = px.bar(df_q_sum.sort_values('Total RVUs', ascending=False),
+                            fig_qv = cached_chart('bar', df_q_sum.sort_values('Total RVUs', ascending=False),
                                             x='Name', y='Total RVUs', text_auto='.2s',
                                             color='Total RVUs', color_continuous_scale=[[0,'#bfdbfe'],[1,'#1E3A8A']],
-                                            title=f"Total Center Volume ({target_q})")
-                            fig_qv.update_layout(coloraxis_showscale=False)
-                            st.plotly_chart(style_high_end_chart(fig_qv), use_container_width=True,
+                                            title=f"Total Center Volume ({target_q})",
+                                            layout=dict(coloraxis_showscale=False))
+                            st.plotly_chart(fig_qv, use_container_width=True,
                                             key=f"qvol_{tab_key_suffix}")
                         with st.container(border=True):
                             st.markdown(f"#### 🩺 Efficiency: wRVU per FTE: {target_q}")
@@ -2191,14 +2426,13 @@ if check_password():
                             ).reset_index()
                             _fte_map = {cid: cfg['fte'] for cid, cfg in CLINIC_CONFIG.items()}
                             df_q_eff['FTE'] = df_q_eff['ID'].map(_fte_map).fillna(1.0)
-                            df_q_eff['RVU per FTE'] = df_q_eff.apply(
-                                lambda x: x['Total RVUs'] / x['FTE'] if x['FTE'] > 0 else 0, axis=1)
-                            fig_qe = px.bar(df_q_eff.sort_values('RVU per FTE', ascending=False),
+                            df_q_eff['RVU per FTE'] = safe_ratio(df_q_eff['Total RVUs'], df_q_eff['FTE'])
+                            fig_qe = cached_chart('bar', df_q_eff.sort_values('RVU per FTE', ascending=False),
                                             x='Name', y='RVU per FTE', text_auto='.0f',
                                             color='RVU per FTE', color_continuous_scale=[[0,'#bfdbfe'],[1,'#1E3A8A']],
-                                            title=f"Quarterly wRVU per FTE ({target_q})")
-                            fig_qe.update_layout(coloraxis_showscale=False)
-                            st.plotly_chart(style_high_end_chart(fig_qe), use_container_width=True,
+                                            title=f"Quarterly wRVU per FTE ({target_q})",
+                                            layout=dict(coloraxis_showscale=False))
+                            st.plotly_chart(fig_qe, use_container_width=True,
                                             key=f"qeff_{tab_key_suffix}")
 
             # ==========================================
@@ -2206,13 +2440,13 @@ if check_password():
             # ==========================================
             if clinic_filter in ["All", "TriStar", "Ascension"] and not df_view.empty:
                 prior_year   = year - 1
-                df_pri_all   = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == prior_year].copy() if not df_clinic_all.empty else pd.DataFrame()
+                df_pri_all   = df_clinic_all[df_clinic_all['Month_Clean'].dt.year == prior_year] if not df_clinic_all.empty else pd.DataFrame()
                 if   clinic_filter == "TriStar":   df_vp = df_pri_all[df_pri_all['ID'].isin(TRISTAR_IDS)]
                 elif clinic_filter == "Ascension": df_vp = df_pri_all[df_pri_all['ID'].isin(ASCENSION_IDS)]
-                else:                              df_vp = df_pri_all.copy()
+                else:                              df_vp = df_pri_all
                 cur_m_set = set(df_view['Month_Clean'].dt.month.unique())
                 df_vp_cmp = df_vp[df_vp['Month_Clean'].dt.month.isin(cur_m_set)] if not df_vp.empty else pd.DataFrame()
-                n_m_adv   = df_view['Month_Clean'].dt.month.nunique()
+                n_m_adv   = len(cur_m_set)
 
                 st.markdown("---")
                 render_section_header("Advanced Analytics",
@@ -2229,7 +2463,7 @@ if check_password():
                     fig_par = go.Figure()
                     fig_par.add_trace(go.Bar(
                         x=par['Name'], y=par['Total RVUs'],
-                        name='wRVUs', marker_color='#1E3A8A', text=par['Total RVUs'].apply(lambda v: f"{v:,.0f}"),
+                        name='wRVUs', marker_color='#1E3A8A', text=par['Total RVUs'].map('{:,.0f}'.format),
                         textposition='outside'))
                     fig_par.add_trace(go.Scatter(
                         x=par['Name'], y=par['Cumulative %'],
@@ -2263,33 +2497,31 @@ if check_password():
                         np3.columns = ['m','Total RVUs']; np3['Year'] = str(prior_year)
                         yoy_c = pd.concat([nc2, np3]).sort_values('m')
                         yoy_c['Month'] = yoy_c['m'].map(_MN)
-                        fig_yoyc = px.bar(yoy_c, x='Month', y='Total RVUs', color='Year', barmode='group',
+                        fig_yoyc = cached_chart('bar', yoy_c, x='Month', y='Total RVUs', color='Year', barmode='group',
                                           text_auto='.2s',
                                           color_discrete_map={str(year):'#1E3A8A', str(prior_year):'#94a3b8'},
                                           labels={'Total RVUs':'wRVUs'})
-                        st.plotly_chart(style_high_end_chart(fig_yoyc), use_container_width=True,
+                        st.plotly_chart(fig_yoyc, use_container_width=True,
                                         key=f"adv_yoy_{tab_key_suffix}_{clinic_filter}")
-                        ytd_c2  = df_view.groupby(['ID','Name'])['Total RVUs'].sum().reset_index()
-                        ytd_p2  = df_vp_cmp.groupby('ID')['Total RVUs'].sum().reset_index().rename(columns={'Total RVUs':'Prior RVUs'})
-                        ytd_cmp = ytd_c2.merge(ytd_p2, on='ID', how='left').fillna({'Prior RVUs':0})
-                        ytd_cmp['YoY Δ'] = ytd_cmp.apply(lambda r: (r['Total RVUs']-r['Prior RVUs'])/r['Prior RVUs'] if r['Prior RVUs']>0 else 0, axis=1)
-                        ytd_cmp['Trend']  = ytd_cmp['YoY Δ'].apply(lambda x: '▲' if x>0.02 else ('▼' if x<-0.02 else '→'))
+                        ytd_cmp = df_view.groupby(['ID','Name'])['Total RVUs'].sum().reset_index()
+                        ytd_cmp['Prior RVUs'] = ytd_cmp['ID'].map(df_vp_cmp.groupby('ID', sort=False)['Total RVUs'].sum()).fillna(0)
+                        ytd_cmp['YoY Δ'] = safe_ratio(ytd_cmp['Total RVUs'] - ytd_cmp['Prior RVUs'], ytd_cmp['Prior RVUs'])
+                        ytd_cmp['Trend']  = trend_arrows(ytd_cmp['YoY Δ'])
                         ytd_cmp = ytd_cmp.sort_values('Total RVUs', ascending=False)
                         render_table(ytd_cmp[['Name','Total RVUs','Prior RVUs','YoY Δ','Trend']]
                                      .style.format({'Total RVUs':'{:,.0f}','Prior RVUs':'{:,.0f}','YoY Δ':'{:+.1%}'})
-                                     .background_gradient(subset=['YoY Δ'], cmap=_LC['RdYlGn']))
+                                     .pipe(gradient, 'RdYlGn', subset=['YoY Δ']))
 
                 # Heatmap -------------------------------------------------------
                 with st.container(border=True):
                     render_section_header(f"wRVU Heatmap: Clinic × Month ({year})",
                                           "Color intensity reveals seasonal patterns and outlier months — red = low, green = high", "🌡️")
-                    piv_h = df_view.pivot_table(index='Name', columns='Month_Label', values='Total RVUs', aggfunc='sum').fillna(0)
-                    piv_h = piv_h.reindex(columns=df_view.sort_values('Month_Clean')['Month_Label'].unique()).fillna(0)
-                    fig_heat = px.imshow(piv_h, text_auto='.0f', aspect='auto',
-                                         color_continuous_scale='RdYlGn',
-                                         labels=dict(x='Month', y='Clinic', color='wRVUs'))
-                    fig_heat.update_layout(height=max(320, len(piv_h)*60))
-                    st.plotly_chart(style_high_end_chart(fig_heat), use_container_width=True,
+                    piv_h = pivot_sum(df_view, 'Name', 'Month_Label', 'Total RVUs')
+                    piv_h = piv_h.reindex(columns=month_order(df_view)).fillna(0)
+                    fig_heat = build_chart('imshow', piv_h, text_auto='.0f', aspect='auto', color_continuous_scale='RdYlGn',
+                                           labels=dict(x='Month', y='Clinic', color='wRVUs'),
+                                           layout=dict(height=max(320, len(piv_h)*60)))
+                    st.plotly_chart(fig_heat, use_container_width=True,
                                     key=f"adv_heat_{tab_key_suffix}_{clinic_filter}")
 
                 # Statistical summary -------------------------------------------
@@ -2302,15 +2534,14 @@ if check_password():
                         'Min Month': grp_s.min(), 'Max Month': grp_s.max(), 'YTD Total': grp_s.sum(),
                     }).reset_index()
                     stat_df['CV (%)'] = (stat_df['Std Dev'] / stat_df['Monthly Mean'] * 100).round(1).fillna(0)
-                    stat_df['Peak/Trough Ratio'] = stat_df.apply(
-                        lambda r: r['Max Month'] / r['Min Month'] if r['Min Month'] > 0 else 0, axis=1)
+                    stat_df['Peak/Trough Ratio'] = safe_ratio(stat_df['Max Month'], stat_df['Min Month'])
                     stat_df = stat_df.sort_values('YTD Total', ascending=False)
                     fmt_s = {'Monthly Mean':'{:,.0f}','Std Dev':'{:,.0f}','Min Month':'{:,.0f}',
                              'Max Month':'{:,.0f}','YTD Total':'{:,.0f}','CV (%)':'{:.1f}%',
                              'Peak/Trough Ratio':'{:.2f}'}
                     render_table(stat_df.style.format(fmt_s)
-                                 .background_gradient(subset=['YTD Total'], cmap=_LC['Blues'])
-                                 .background_gradient(subset=['CV (%)'], cmap=_LC['RdYlGn_r']))
+                                 .pipe(gradient, 'Blues', subset=['YTD Total'])
+                                 .pipe(gradient, 'RdYlGn_r', subset=['CV (%)']))
                     st.caption(
                         "**CV** (Coefficient of Variation) = Std Dev ÷ Mean — lower CV indicates more consistent monthly volume. "
                         "**Peak/Trough Ratio** = best month ÷ worst month — values near 1.0 indicate stable year-round demand."
@@ -2331,24 +2562,24 @@ if check_password():
                                         'Δ vs Prior':( proj-prior)/prior if prior>0 else 0})
                         if pr2:
                             prj = pd.DataFrame(pr2).sort_values('Projected Annual', ascending=False)
-                            fig_prj = px.bar(
+                            fig_prj = cached_chart('bar',
                                 prj.melt(id_vars='Clinic', value_vars=['YTD wRVUs','Projected Annual']),
                                 x='Clinic', y='value', color='variable', barmode='group', text_auto='.2s',
                                 color_discrete_sequence=['#1E3A8A','#93c5fd'],
                                 labels={'value':'wRVUs','variable':''})
-                            st.plotly_chart(style_high_end_chart(fig_prj), use_container_width=True,
+                            st.plotly_chart(fig_prj, use_container_width=True,
                                             key=f"adv_proj_{tab_key_suffix}_{clinic_filter}")
                             fmt_pr = {'YTD wRVUs':'{:,.0f}','Projected Annual':'{:,.0f}',
                                       'Proj wRVU/FTE':'{:,.0f}','Prior Year Total':'{:,.0f}','Δ vs Prior':'{:+.1%}'}
                             render_table(prj.style.format(fmt_pr)
-                                         .background_gradient(subset=['Projected Annual','Δ vs Prior'], cmap=_LC['Greens']))
+                                         .pipe(gradient, 'Greens', subset=['Projected Annual','Δ vs Prior']))
 
             # --- Detailed per-clinic breakdown (TriStar / Ascension) ---
             if clinic_filter in ["TriStar", "Ascension"]:
                 st.markdown("---")
                 st.subheader(f"🔍 Detailed Breakdown by Clinic ({view_title})")
                 target_ids = TRISTAR_IDS if clinic_filter == "TriStar" else ASCENSION_IDS
-                df_prov_yr = df_provider_raw[df_provider_raw['Month_Clean'].dt.year == year].copy() if not df_provider_raw.empty else pd.DataFrame()
+                df_prov_yr = df_provider_raw[df_provider_raw['Month_Clean'].dt.year == year] if not df_provider_raw.empty else pd.DataFrame()
                 for c_id in target_ids:
                     c_name = CLINIC_CONFIG.get(c_id, {}).get('name', c_id)
                     # FIX #5: proper source_type column check
@@ -2374,24 +2605,24 @@ if check_password():
                             st.markdown(f"#### 🍰 {c_name}: Work Breakdown")
                             cp1, cp2 = st.columns(2)
                             with cp1:
-                                fig_p1 = px.pie(pie_ytd, values='Total RVUs', names='Name', hole=0.4, title=f"{year} Total")
-                                fig_p1.update_traces(textposition='inside', textinfo='percent+label')
-                                st.plotly_chart(style_high_end_chart(fig_p1), use_container_width=True,
+                                fig_p1 = cached_chart('pie', pie_ytd, values='Total RVUs', names='Name', hole=0.4, title=f"{year} Total",
+                                                      traces=dict(textposition='inside', textinfo='percent+label'))
+                                st.plotly_chart(fig_p1, use_container_width=True,
                                                 key=f"pie_ytd_{tab_key_suffix}_{c_id}")
                             with cp2:
                                 if not pie_q.empty:
-                                    fig_p2 = px.pie(pie_q, values='Total RVUs', names='Name', hole=0.4, title=f"Most Recent Quarter ({latest_q})")
-                                    fig_p2.update_traces(textposition='inside', textinfo='percent+label')
-                                    st.plotly_chart(style_high_end_chart(fig_p2), use_container_width=True,
+                                    fig_p2 = cached_chart('pie', pie_q, values='Total RVUs', names='Name', hole=0.4, title=f"Most Recent Quarter ({latest_q})",
+                                                          traces=dict(textposition='inside', textinfo='percent+label'))
+                                    st.plotly_chart(fig_p2, use_container_width=True,
                                                     key=f"pie_q_{tab_key_suffix}_{c_id}")
                     with st.container(border=True):
                         st.markdown(f"#### 🧑‍⚕️ {c_name}: Monthly Data (by Provider)")
-                        piv_p = cpdf.pivot_table(index="Name", columns="Month_Label", values="Total RVUs", aggfunc="sum").fillna(0)
-                        sorted_m = cpdf.sort_values("Month_Clean")["Month_Label"].unique()
+                        piv_p = pivot_sum(cpdf, "Name", "Month_Label", "Total RVUs")
+                        sorted_m = month_order(cpdf)
                         piv_p = piv_p.reindex(columns=sorted_m).fillna(0)
                         piv_p["Total"] = piv_p.sum(axis=1)
                         render_table(piv_p.sort_values("Total", ascending=False).style
-                                     .format("{:,.0f}").background_gradient(cmap=_LC['Blues']))
+                                     .format("{:,.0f}").pipe(gradient, 'Blues'))
                     # POS trend for this clinic
                     if not df_pos_trend.empty:
                         df_pos_yr2 = df_pos_trend[df_pos_trend['Month_Clean'].dt.year == year]
@@ -2400,18 +2631,18 @@ if check_password():
                             with st.container(border=True):
                                 st.markdown(f"#### 🆕 {c_name}: New Patient Trend")
                                 pos_agg = pos_df.groupby('Month_Clean')[['New Patients']].sum().reset_index().sort_values('Month_Clean')
-                                fig_pos = px.bar(pos_agg, x='Month_Clean', y='New Patients', text_auto=True)
-                                st.plotly_chart(style_high_end_chart(fig_pos), use_container_width=True,
+                                fig_pos = cached_chart('bar', pos_agg, x='Month_Clean', y='New Patients', text_auto=True)
+                                st.plotly_chart(fig_pos, use_container_width=True,
                                                 key=f"pos_{tab_key_suffix}_{c_id}")
-                                pos_piv = pos_df.pivot_table(index="Clinic_Tag", columns="Month_Label", values="New Patients", aggfunc="sum").fillna(0)
-                                sorted_mp = pos_df.sort_values("Month_Clean")["Month_Label"].unique()
+                                pos_piv = pivot_sum(pos_df, "Clinic_Tag", "Month_Label", "New Patients")
+                                sorted_mp = month_order(pos_df)
                                 pos_piv = pos_piv.reindex(columns=sorted_mp).fillna(0)
                                 pos_piv["Total"] = pos_piv.sum(axis=1)
-                                render_table(pos_piv.style.format("{:,.0f}").background_gradient(cmap=_LC['Greens']))
+                                render_table(pos_piv.style.format("{:,.0f}").pipe(gradient, 'Greens'))
 
             # --- Single-clinic pie + provider table ---
             if target_tag and not df_provider_raw.empty:
-                df_prov_yr = df_provider_raw[df_provider_raw['Month_Clean'].dt.year == year].copy()
+                df_prov_yr = df_provider_raw[df_provider_raw['Month_Clean'].dt.year == year]
                 # FIX #5: proper source_type check
                 if 'source_type' in df_prov_yr.columns:
                     pie_src = df_prov_yr[(df_prov_yr['Clinic_Tag'] == target_tag) & (df_prov_yr['source_type'] == 'detail')]
@@ -2433,27 +2664,27 @@ if check_password():
                                 st.markdown("#### 🍰 Work Breakdown: Who performed the work?")
                                 cp1, cp2 = st.columns(2)
                                 with cp1:
-                                    fig_p1 = px.pie(pie_ytd, values='Total RVUs', names='Name', hole=0.4, title=f"{year} Total")
-                                    fig_p1.update_traces(textposition='inside', textinfo='percent+label')
-                                    st.plotly_chart(style_high_end_chart(fig_p1), use_container_width=True,
+                                    fig_p1 = cached_chart('pie', pie_ytd, values='Total RVUs', names='Name', hole=0.4, title=f"{year} Total",
+                                                          traces=dict(textposition='inside', textinfo='percent+label'))
+                                    st.plotly_chart(fig_p1, use_container_width=True,
                                                     key=f"pie_src_ytd_{tab_key_suffix}_{target_tag}")
                                 with cp2:
                                     if not pie_q.empty:
-                                        fig_p2 = px.pie(pie_q, values='Total RVUs', names='Name', hole=0.4, title=f"Most Recent Quarter ({latest_q})")
-                                        fig_p2.update_traces(textposition='inside', textinfo='percent+label')
-                                        st.plotly_chart(style_high_end_chart(fig_p2), use_container_width=True,
+                                        fig_p2 = cached_chart('pie', pie_q, values='Total RVUs', names='Name', hole=0.4, title=f"Most Recent Quarter ({latest_q})",
+                                                              traces=dict(textposition='inside', textinfo='percent+label'))
+                                        st.plotly_chart(fig_p2, use_container_width=True,
                                                         key=f"pie_src_q_{tab_key_suffix}_{target_tag}")
                     except Exception:
                         st.info("Insufficient data for pie charts.")
 
                     with st.container(border=True):
                         st.markdown("#### 🧑‍⚕️ Monthly Data (by Provider)")
-                        piv_p = pie_src.pivot_table(index="Name", columns="Month_Label", values="Total RVUs", aggfunc="sum").fillna(0)
-                        sorted_m = pie_src.sort_values("Month_Clean")["Month_Label"].unique()
+                        piv_p = pivot_sum(pie_src, "Name", "Month_Label", "Total RVUs")
+                        sorted_m = month_order(pie_src)
                         piv_p = piv_p.reindex(columns=sorted_m).fillna(0)
                         piv_p["Total"] = piv_p.sum(axis=1)
                         render_table(piv_p.sort_values("Total", ascending=False).style
-                                     .format("{:,.0f}").background_gradient(cmap=_LC['Blues']))
+                                     .format("{:,.0f}").pipe(gradient, 'Blues'))
 
             # --- Visits (LROC / TROC / TOPC) ---
             if target_tag in ["LROC", "TROC", "TOPC"] and not df_visits.empty:
@@ -2466,28 +2697,28 @@ if check_password():
                         lv_df = cli_vis[cli_vis['Month_Clean'] == lv]
                         cv1, cv2 = st.columns(2)
                         with cv1:
-                            fig_ov = px.bar(lv_df.sort_values('Total Visits', ascending=True),
+                            fig_ov = cached_chart('bar', lv_df.sort_values('Total Visits', ascending=True),
                                             x='Total Visits', y='Name', orientation='h', text_auto=True,
                                             color='Total Visits', color_continuous_scale='Blues',
-                                            title=f"YTD Total Office Visits ({lv.strftime('%b %Y')})")
-                            fig_ov.update_layout(height=800)
-                            st.plotly_chart(style_high_end_chart(fig_ov), use_container_width=True,
+                                            title=f"YTD Total Office Visits ({lv.strftime('%b %Y')})",
+                                            layout=dict(height=800))
+                            st.plotly_chart(fig_ov, use_container_width=True,
                                             key=f"ov_{tab_key_suffix}_{target_tag}")
                         with cv2:
-                            fig_np = px.bar(lv_df.sort_values('New Patients', ascending=True),
+                            fig_np = cached_chart('bar', lv_df.sort_values('New Patients', ascending=True),
                                             x='New Patients', y='Name', orientation='h', text_auto=True,
                                             color='New Patients', color_continuous_scale='Greens',
-                                            title=f"YTD New Patients ({lv.strftime('%b %Y')})")
-                            fig_np.update_layout(height=800)
-                            st.plotly_chart(style_high_end_chart(fig_np), use_container_width=True,
+                                            title=f"YTD New Patients ({lv.strftime('%b %Y')})",
+                                            layout=dict(height=800))
+                            st.plotly_chart(fig_np, use_container_width=True,
                                             key=f"np_{tab_key_suffix}_{target_tag}")
                     with st.container(border=True):
                         st.markdown("#### 📉 YoY Change: New Patients")
-                        fig_diff = px.bar(lv_df.sort_values('NP_Diff', ascending=True),
+                        fig_diff = cached_chart('bar', lv_df.sort_values('NP_Diff', ascending=True),
                                           x='NP_Diff', y='Name', orientation='h', text_auto=True,
-                                          color='NP_Diff', color_continuous_scale='RdBu')
-                        fig_diff.update_layout(height=800)
-                        st.plotly_chart(style_high_end_chart(fig_diff), use_container_width=True,
+                                          color='NP_Diff', color_continuous_scale='RdBu',
+                                          layout=dict(height=800))
+                        st.plotly_chart(fig_diff, use_container_width=True,
                                         key=f"npdiff_{tab_key_suffix}_{target_tag}")
 
     # ==========================================
@@ -2500,17 +2731,22 @@ if check_password():
             md_view = st.radio("Select View:", ["wRVU Productivity", "Office Visits", "77470 Special Procedures"],
                                key=f"md_radio_{tab_key_suffix}")
         with col_main:
-            df_mds_yr = df_mds[df_mds['Month_Clean'].dt.year == year].copy() if not df_mds.empty else pd.DataFrame()
-            if not df_mds_yr.empty:
-                df_mds_yr['Name'] = df_mds_yr['Name'].apply(
-                    lambda n: f"{n} (Ret.)" if n in RETIRED_PROVIDERS else n)
-            df_mds_yr_active = df_mds_yr[~df_mds_yr['Name'].str.endswith('(Ret.)')].copy()
+            if not df_mds.empty:
+                # Relabel retired physicians in one vectorized column swap (no frame copy / row apply)
+                df_mds_yr = df_mds[df_mds['Month_Clean'].dt.year == year]
+                retired   = df_mds_yr['Name'].isin(RETIRED_PROVIDERS).to_numpy()
+                df_mds_yr = df_mds_yr.assign(Name=np.where(retired, df_mds_yr['Name'] + " (Ret.)", df_mds_yr['Name']))
+                df_mds_yr_active = df_mds_yr[~retired]
+            else:
+                df_mds_yr = df_mds_yr_active = pd.DataFrame()
 
             if md_view == "wRVU Productivity":
                 if df_mds_yr.empty:
                     st.info(f"No Physician productivity data found for {year}.")
                 else:
                     st.info(generate_narrative(df_mds_yr, "Physician"))
+                    # Per-physician YTD totals, shared by the YTD bar, MGMA and YoY panels
+                    md_ytd_tot = df_mds_yr.groupby('Name')['Total RVUs'].sum()
                     with st.container(border=True):
                         render_section_header(f"{year} Physician Productivity Trend",
                                               "Monthly wRVU/FTE with 3-month rolling average (dashed) — smooths short-term variability to reveal the underlying trend", "📈")
@@ -2540,22 +2776,22 @@ if check_password():
                                         key=f"md_trend_{tab_key_suffix}")
                     with st.container(border=True):
                         st.markdown("#### 🔢 Monthly Data")
-                        piv = df_mds_yr.pivot_table(index="Name", columns="Month_Label", values="Total RVUs", aggfunc="sum").fillna(0)
-                        sorted_m = df_mds_yr.sort_values("Month_Clean")["Month_Label"].unique()
+                        piv = pivot_sum(df_mds_yr, "Name", "Month_Label", "Total RVUs")
+                        sorted_m = month_order(df_mds_yr)
                         piv = piv.reindex(columns=sorted_m).fillna(0)
                         piv["Total"] = piv.sum(axis=1)
                         render_table(piv.sort_values("Total", ascending=False).style
-                                     .format("{:,.0f}").background_gradient(cmap=_LC['Blues']))
+                                     .format("{:,.0f}").pipe(gradient, 'Blues'))
                     with st.container(border=True):
                         st.markdown("#### 🏆 YTD Total RVUs")
-                        ytd_s = df_mds_yr.groupby('Name')[['Total RVUs']].sum().reset_index().sort_values('Total RVUs', ascending=False)
-                        fig_ytd = px.bar(ytd_s, x='Name', y='Total RVUs', color='Total RVUs',
+                        ytd_s = md_ytd_tot.reset_index().sort_values('Total RVUs', ascending=False)
+                        fig_ytd = cached_chart('bar', ytd_s, x='Name', y='Total RVUs', color='Total RVUs',
                                          color_continuous_scale=[[0,'#bfdbfe'],[1,'#1E3A8A']],
                                          text_auto='.2s',
-                                         title=f"YTD wRVU Production by Physician — {year}")
-                        fig_ytd.update_layout(coloraxis_showscale=False)
-                        fig_ytd.update_traces(textfont_size=12, textposition='outside', cliponaxis=False)
-                        st.plotly_chart(style_high_end_chart(fig_ytd), use_container_width=True,
+                                         title=f"YTD wRVU Production by Physician — {year}",
+                                         layout=dict(coloraxis_showscale=False),
+                                         traces=dict(textfont_size=12, textposition='outside', cliponaxis=False))
+                        st.plotly_chart(fig_ytd, use_container_width=True,
                                         key=f"md_ytd_{tab_key_suffix}")
 
                     # MGMA benchmarking -----------------------------------------
@@ -2564,7 +2800,7 @@ if check_password():
                         render_section_header("MGMA Benchmark Comparison",
                                               f"Individual physician wRVUs vs national Radiation Oncology MGMA percentile norms ({n_md_m}-month YTD)", "🎯")
                         MGMA_EXCLUDE = {"Cohen"}
-                        ytd_mgma = (df_mds_yr.groupby('Name')[['Total RVUs']].sum().reset_index()
+                        ytd_mgma = (md_ytd_tot.reset_index()
                                     .loc[lambda d: ~d['Name'].isin(MGMA_EXCLUDE) & ~d['Name'].str.endswith('(Ret.)')]
                                     .sort_values('Total RVUs', ascending=False))
                         ref_25   = MGMA_BENCHMARKS['25th'] / 12 * n_md_m
@@ -2600,15 +2836,11 @@ if check_password():
                         ytd_mgma['vs 25th'] = ytd_mgma['Total RVUs'] / ref_25 - 1
                         ytd_mgma['vs 50th'] = ytd_mgma['Total RVUs'] / ref_50 - 1
                         ytd_mgma['vs 75th'] = ytd_mgma['Total RVUs'] / ref_75 - 1
-                        ytd_mgma['Productivity Tier'] = ytd_mgma['Total RVUs'].apply(
-                            lambda x: '🥇 Elite (>75th)' if x > ref_75
-                            else ('✅ Above Avg (50–75th)' if x > ref_50
-                            else ('⚠️ Average (25–50th)' if x > ref_25
-                            else '🔴 Below Avg (<25th)')))
+                        ytd_mgma['Productivity Tier'] = productivity_tier(ytd_mgma['Total RVUs'], ref_25, ref_50, ref_75)
                         render_table(ytd_mgma[['Name','Total RVUs','vs 25th','vs 50th','vs 75th','Productivity Tier']]
                                      .style.format({'Total RVUs':'{:,.0f}','vs 25th':'{:+.1%}',
                                                     'vs 50th':'{:+.1%}','vs 75th':'{:+.1%}'})
-                                     .background_gradient(subset=['vs 50th'], cmap=_LC['RdYlGn']))
+                                     .pipe(gradient, 'RdYlGn', subset=['vs 50th']))
                         elite_md  = (ytd_mgma['Total RVUs'] > ref_75).sum()
                         below_md  = (ytd_mgma['Total RVUs'] < ref_25).sum()
                         st.caption(
@@ -2621,42 +2853,41 @@ if check_password():
                     with st.container(border=True):
                         render_section_header("Physician Productivity Heatmap",
                                               "Monthly wRVU by physician — identifies seasonal dips, leave patterns, and outlier months", "🌡️")
-                        piv_mh = df_mds_yr_active.pivot_table(index='Name', columns='Month_Label', values='Total RVUs', aggfunc='sum').fillna(0)
-                        piv_mh = piv_mh.reindex(columns=df_mds_yr_active.sort_values('Month_Clean')['Month_Label'].unique()).fillna(0)
-                        fig_mheat = px.imshow(piv_mh, text_auto='.0f', aspect='auto',
-                                              color_continuous_scale='Blues',
-                                              labels=dict(x='Month', y='Physician', color='wRVUs'))
-                        fig_mheat.update_layout(height=max(200, len(piv_mh)*30))
-                        st.plotly_chart(style_high_end_chart(fig_mheat), use_container_width=True,
+                        piv_mh = pivot_sum(df_mds_yr_active, 'Name', 'Month_Label', 'Total RVUs')
+                        piv_mh = piv_mh.reindex(columns=month_order(df_mds_yr_active)).fillna(0)
+                        fig_mheat = build_chart('imshow', piv_mh, text_auto='.0f', aspect='auto', color_continuous_scale='Blues',
+                                                labels=dict(x='Month', y='Physician', color='wRVUs'),
+                                                layout=dict(height=max(200, len(piv_mh)*30)))
+                        st.plotly_chart(fig_mheat, use_container_width=True,
                                         key=f"md_heat_{tab_key_suffix}")
 
                     # Year-over-year physician comparison -----------------------
                     _prior_y    = year - 1
-                    _df_mds_pri = df_mds[df_mds['Month_Clean'].dt.year == _prior_y].copy() if not df_mds.empty else pd.DataFrame()
+                    _df_mds_pri = df_mds[df_mds['Month_Clean'].dt.year == _prior_y] if not df_mds.empty else pd.DataFrame()
                     if not _df_mds_pri.empty:
                         _cur_m = set(df_mds_yr['Month_Clean'].dt.month.unique())
                         _df_mds_pri_cmp = _df_mds_pri[_df_mds_pri['Month_Clean'].dt.month.isin(_cur_m)]
                         if not _df_mds_pri_cmp.empty:
                             with st.container(border=True):
                                 st.markdown(f"#### 📅 Year-over-Year: Physician wRVUs ({year} vs {_prior_y})")
-                                yc = df_mds_yr.groupby('Name')['Total RVUs'].sum().reset_index(); yc['Year'] = str(year)
+                                yc = md_ytd_tot.reset_index(); yc['Year'] = str(year)
                                 yp = _df_mds_pri_cmp.groupby('Name')['Total RVUs'].sum().reset_index(); yp['Year'] = str(_prior_y)
-                                fig_yoym = px.bar(pd.concat([yc, yp]), x='Name', y='Total RVUs',
+                                fig_yoym = cached_chart('bar', pd.concat([yc, yp]), x='Name', y='Total RVUs',
                                                   color='Year', barmode='group', text_auto='.2s',
                                                   color_discrete_map={str(year):'#1E3A8A', str(_prior_y):'#94a3b8'},
                                                   labels={'Total RVUs':'wRVUs'})
-                                st.plotly_chart(style_high_end_chart(fig_yoym), use_container_width=True,
+                                st.plotly_chart(fig_yoym, use_container_width=True,
                                                 key=f"md_yoy_{tab_key_suffix}")
 
                     # Monthly distribution box plot -----------------------------
                     with st.container(border=True):
                         render_section_header("Monthly wRVU Distribution by Physician",
                                               "Box-and-whisker plot of monthly production — reveals variability and outliers at the individual level", "📦")
-                        fig_box = px.box(df_mds_yr_active.sort_values('Name'), x='Name', y='Total RVUs',
+                        fig_box = cached_chart('box', df_mds_yr_active.sort_values('Name'), x='Name', y='Total RVUs',
                                          color='Name', points='all',
-                                         labels={'Total RVUs':'Monthly wRVUs', 'Name':'Physician'})
-                        fig_box.update_layout(showlegend=False, height=480)
-                        st.plotly_chart(style_high_end_chart(fig_box), use_container_width=True,
+                                         labels={'Total RVUs':'Monthly wRVUs', 'Name':'Physician'},
+                                         layout=dict(showlegend=False, height=480))
+                        st.plotly_chart(fig_box, use_container_width=True,
                                         key=f"md_box_{tab_key_suffix}")
                         st.caption(
                             "Box spans IQR (Q1–Q3); center line = median; whiskers = 1.5× IQR; dots = individual months. "
@@ -2674,22 +2905,21 @@ if check_password():
                             'Min Month': md_grp.min(), 'Max Month': md_grp.max(), 'YTD Total': md_grp.sum(),
                         }).reset_index()
                         md_stat['CV (%)'] = (md_stat['Std Dev'] / md_stat['Monthly Mean'] * 100).round(1).fillna(0)
-                        md_stat['Peak/Trough'] = md_stat.apply(
-                            lambda r: r['Max Month'] / r['Min Month'] if r['Min Month'] > 0 else 0, axis=1)
+                        md_stat['Peak/Trough'] = safe_ratio(md_stat['Max Month'], md_stat['Min Month'])
                         md_stat = md_stat.sort_values('YTD Total', ascending=False)
                         fmt_ms  = {'Monthly Mean':'{:,.0f}','Std Dev':'{:,.0f}','Min Month':'{:,.0f}',
                                    'Max Month':'{:,.0f}','YTD Total':'{:,.0f}','CV (%)':'{:.1f}%',
                                    'Peak/Trough':'{:.2f}'}
                         render_table(md_stat.style.format(fmt_ms)
-                                     .background_gradient(subset=['YTD Total'], cmap=_LC['Purples'])
-                                     .background_gradient(subset=['CV (%)'], cmap=_LC['RdYlGn_r']))
+                                     .pipe(gradient, 'Purples', subset=['YTD Total'])
+                                     .pipe(gradient, 'RdYlGn_r', subset=['CV (%)']))
                         st.caption(
                             "**CV** = Std Dev ÷ Mean × 100 — lower values indicate more predictable monthly output. "
                             "**Peak/Trough** = best month ÷ worst month — values near 1.0 indicate stable scheduling year-round."
                         )
 
             elif md_view == "Office Visits":
-                df_vis_yr = df_visits[df_visits['Month_Clean'].dt.year == year].copy() if not df_visits.empty else pd.DataFrame()
+                df_vis_yr = df_visits[df_visits['Month_Clean'].dt.year == year] if not df_visits.empty else pd.DataFrame()
                 st.info("ℹ️ **Includes all HOPD and freestanding sites (LROC, TROC, TOPC)**")
                 if df_vis_yr.empty:
                     st.warning(f"No Office Visit data found for {year}.")
@@ -2698,26 +2928,26 @@ if check_password():
                         {'Total Visits': 'sum', 'New Patients': 'sum', 'Visits_Diff': 'sum', 'NP_Diff': 'sum'})
                     lv = df_vis_agg['Month_Clean'].max()
                     lv_df = df_vis_agg[df_vis_agg['Month_Clean'] == lv]
-                    lv_df = lv_df[~lv_df['Name'].isin(APP_LIST)]
+                    lv_df = lv_df[~lv_df['Name'].isin(APP_SET)]
                     with st.container(border=True):
                         st.markdown(f"#### 🏥 Total Office Visits ({year} YTD)")
-                        fig_ov = px.bar(lv_df.sort_values('Total Visits', ascending=True),
+                        fig_ov = cached_chart('bar', lv_df.sort_values('Total Visits', ascending=True),
                                         x='Total Visits', y='Name', orientation='h', text_auto=True,
-                                        color='Total Visits', color_continuous_scale='Blues')
-                        fig_ov.update_layout(height=500)
-                        st.plotly_chart(style_high_end_chart(fig_ov), use_container_width=True,
+                                        color='Total Visits', color_continuous_scale='Blues',
+                                        layout=dict(height=500))
+                        st.plotly_chart(fig_ov, use_container_width=True,
                                         key=f"vis_ov_{tab_key_suffix}")
                     with st.container(border=True):
                         st.markdown(f"#### 🆕 New Patients ({year} YTD)")
-                        fig_np = px.bar(lv_df.sort_values('New Patients', ascending=True),
+                        fig_np = cached_chart('bar', lv_df.sort_values('New Patients', ascending=True),
                                         x='New Patients', y='Name', orientation='h', text_auto=True,
-                                        color='New Patients', color_continuous_scale='Greens')
-                        fig_np.update_layout(height=500)
-                        st.plotly_chart(style_high_end_chart(fig_np), use_container_width=True,
+                                        color='New Patients', color_continuous_scale='Greens',
+                                        layout=dict(height=500))
+                        st.plotly_chart(fig_np, use_container_width=True,
                                         key=f"vis_np_{tab_key_suffix}")
 
             elif md_view == "77470 Special Procedures":
-                df_77470_yr = df_md_77470[df_md_77470['Month_Clean'].dt.year == year].copy() if not df_md_77470.empty else pd.DataFrame()
+                df_77470_yr = df_md_77470[df_md_77470['Month_Clean'].dt.year == year] if not df_md_77470.empty else pd.DataFrame()
                 st.markdown(f"### 🔬 CPT 77470 — Special Treatment Procedure ({year})")
                 st.info(f"Estimated procedure counts derived from wRVU amounts ÷ {CPT_77470_WRVU} (2026 PC wRVU value for 77470).")
                 if df_77470_yr.empty:
@@ -2727,52 +2957,49 @@ if check_password():
                         lines = (scan_77470_log or []) + errs
                         st.code("\n".join(lines[:100]) if lines else "(no log entries)")
                 else:
-                    sorted_m = df_77470_yr.sort_values("Month_Clean")["Month_Label"].unique()
+                    sorted_m = month_order(df_77470_yr)
 
                     with st.container(border=True):
                         st.markdown("#### 📅 Monthly Trend")
-                        fig_t = px.line(
+                        fig_t = cached_chart('line',
                             df_77470_yr.sort_values("Month_Clean"),
                             x="Month_Clean", y="Count", color="Name", markers=True,
                             labels={"Count": "Estimated Procedures", "Month_Clean": "Month"},
                         )
-                        st.plotly_chart(style_high_end_chart(fig_t), use_container_width=True,
+                        st.plotly_chart(fig_t, use_container_width=True,
                                         key=f"md_77470_trend_{tab_key_suffix}")
 
                     with st.container(border=True):
                         st.markdown("#### 🔢 Monthly Count by Provider")
-                        piv_77470 = df_77470_yr.pivot_table(
-                            index="Name", columns="Month_Label", values="Count", aggfunc="sum"
-                        ).fillna(0)
-                        piv_77470 = piv_77470.reindex(columns=sorted_m).fillna(0)
+                        piv_77470 = pivot_sum(df_77470_yr, "Name", "Month_Label", "Count").reindex(columns=sorted_m, fill_value=0)
                         piv_77470["Total"] = piv_77470.sum(axis=1)
                         render_table(
                             piv_77470.sort_values("Total", ascending=False).style
-                            .format("{:,.1f}").background_gradient(cmap=_LC['Purples'])
+                            .format("{:,.1f}").pipe(gradient, 'Purples')
                         )
                     with st.container(border=True):
                         st.markdown(f"#### 🏆 {year} YTD Total")
                         ytd_77470 = df_77470_yr.groupby("Name")["Count"].sum().reset_index()
                         ytd_77470 = ytd_77470.sort_values("Count", ascending=False)
-                        fig_ytd = px.bar(
+                        fig_ytd = cached_chart('bar',
                             ytd_77470, x="Name", y="Count", text_auto=".1f",
                             color="Count", color_continuous_scale="Purples",
                             labels={"Count": "Estimated Procedures"},
                         )
-                        st.plotly_chart(style_high_end_chart(fig_ytd), use_container_width=True,
+                        st.plotly_chart(fig_ytd, use_container_width=True,
                                         key=f"md_77470_ytd_{tab_key_suffix}")
 
             # 77263 table — always shown at the bottom of the MD tab
             st.markdown("---")
-            df_77_yr = df_md_consults[df_md_consults['Month_Clean'].dt.year == year].copy() if not df_md_consults.empty else pd.DataFrame()
+            df_77_yr = df_md_consults[df_md_consults['Month_Clean'].dt.year == year] if not df_md_consults.empty else pd.DataFrame()
             if not df_77_yr.empty:
                 st.markdown(f"### 📝 MD Tx Plan Complex (CPT 77263) — {year}")
-                sorted_m = df_77_yr.sort_values("Month_Clean")["Month_Label"].unique()
-                piv_77 = df_77_yr.pivot_table(index="Name", columns="Month_Label", values="Count", aggfunc="sum").fillna(0)
+                sorted_m = month_order(df_77_yr)
+                piv_77 = pivot_sum(df_77_yr, "Name", "Month_Label", "Count")
                 piv_77 = piv_77.reindex(columns=sorted_m).fillna(0)
                 piv_77["Total"] = piv_77.sum(axis=1)
                 render_table(piv_77.sort_values("Total", ascending=False).style
-                             .format("{:,.0f}").background_gradient(cmap=_LC['Blues']))
+                             .format("{:,.0f}").pipe(gradient, 'Blues'))
 
                 # 77263 / New Patients ratio (2025 only — needs visit data)
                 if year == 2025 and not df_visits.empty:
@@ -2780,19 +3007,20 @@ if check_password():
                     df_vis_agg2 = df_vis_yr2.groupby(['Name', 'Month_Clean'], as_index=False).agg({'Total Visits': 'sum', 'New Patients': 'sum'})
                     lv2 = df_vis_agg2['Month_Clean'].max()
                     lv_df2 = df_vis_agg2[df_vis_agg2['Month_Clean'] == lv2]
-                    lv_df2 = lv_df2[~lv_df2['Name'].isin(APP_LIST)]
+                    lv_df2 = lv_df2[~lv_df2['Name'].isin(APP_SET)]
                     md_ytd = df_77_yr.groupby('Name')['Count'].sum().reset_index()
                     ratio_df = pd.merge(md_ytd, lv_df2[['Name', 'New Patients']], on='Name', how='inner')
-                    ratio_df['Ratio'] = ratio_df.apply(lambda x: x['Count'] / x['New Patients'] if x['New Patients'] > 0 else 0, axis=1)
-                    ratio_df['Label'] = ratio_df.apply(lambda x: f"{x['Ratio']:.2f} ({int(x['Count'])}/{int(x['New Patients'])})", axis=1)
+                    ratio_df['Ratio'] = safe_ratio(ratio_df['Count'], ratio_df['New Patients'])
+                    ratio_df['Label'] = (ratio_df['Ratio'].map('{:.2f}'.format) + ' (' + ratio_df['Count'].astype(int).astype(str)
+                                         + '/' + ratio_df['New Patients'].astype(int).astype(str) + ')')
                     if not ratio_df.empty:
                         st.markdown("---")
                         st.markdown("### 📊 Ratio: Tx Plan (77263) / New Patients (YTD)")
-                        fig_ratio = px.bar(ratio_df.sort_values('Ratio', ascending=True),
+                        fig_ratio = cached_chart('bar', ratio_df.sort_values('Ratio', ascending=True),
                                            x='Ratio', y='Name', orientation='h', text='Label',
-                                           title="Ratio > 1.0 = more Tx Plans than New Patients")
-                        fig_ratio.update_traces(textposition='outside')
-                        st.plotly_chart(style_high_end_chart(fig_ratio), use_container_width=True,
+                                           title="Ratio > 1.0 = more Tx Plans than New Patients",
+                                           traces=dict(textposition='outside'))
+                        st.plotly_chart(fig_ratio, use_container_width=True,
                                         key=f"ratio_{tab_key_suffix}")
 
     # ==========================================
@@ -2838,19 +3066,25 @@ if check_password():
         with st.spinner("Analyzing files..."):
             (df_clinic, df_md_global, df_provider_raw, df_visits, df_financial,
              df_pos_trend, df_consults, df_app_cpt, df_md_cpt, df_md_consults, df_md_77470,
-             debug_log, consult_log, prov_log, scan_77470_log) = process_files(all_files)
+             debug_log, consult_log, prov_log, scan_77470_log) = process_files(
+                tuple(file_payload(f) for f in all_files))
 
         if df_clinic.empty and df_md_global.empty:
             st.error("No valid data found. Check that your files are in the Reports folder.")
         else:
-            valid_providers = set(PROVIDER_CONFIG.keys())
             if not df_md_global.empty:
-                df_apps = df_md_global[df_md_global['Name'].isin(APP_LIST)]
-                df_mds  = df_md_global[(df_md_global['Name'].isin(valid_providers)) & (~df_md_global['Name'].isin(APP_LIST))]
+                is_app  = df_md_global['Name'].isin(APP_SET)   # one mask for both halves of the split
+                df_apps = df_md_global[is_app]
+                df_mds  = df_md_global[df_md_global['Name'].isin(PROVIDER_SET) & ~is_app]
             else:
                 df_apps = pd.DataFrame()
                 df_mds  = pd.DataFrame()
 
+            # Only the open tab is rendered; keep the hidden tabs' widget choices alive meanwhile
+            for key in TAB_WIDGET_KEYS:
+                if key in st.session_state:
+                    st.session_state[key] = st.session_state[key]
+
             tab_exec, tab_c26, tab_c25, tab_md26, tab_md25, tab_app, tab_fin = st.tabs([
                 "📊 Executive Summary",
                 "🏥 Clinic Analytics - 2026",
@@ -2859,270 +3093,275 @@ if check_password():
                 "👨‍⚕️ MD Analytics - 2025",
                 "👩‍⚕️ APP Analytics",
                 "💰 Financials",
-            ])
+            ], key="main_tab", on_change="rerun")
 
-            with tab_exec:
-                render_executive_summary(2026, df_clinic, df_mds, df_visits, df_financial)
+            if tab_exec.open:
+                with tab_exec:
+                    render_executive_summary(2026, df_clinic, df_mds, df_visits, df_financial)
 
-            with tab_c26:
-                render_clinic_tab(2026, df_clinic, df_provider_raw, df_pos_trend, df_consults, "26")
+            if tab_c26.open:
+                with tab_c26:
+                    render_clinic_tab(2026, df_clinic, df_provider_raw, df_pos_trend, df_consults, "26")
 
-            with tab_c25:
-                render_clinic_tab(2025, df_clinic, df_provider_raw, df_pos_trend, df_consults, "25")
+            if tab_c25.open:
+                with tab_c25:
+                    render_clinic_tab(2025, df_clinic, df_provider_raw, df_pos_trend, df_consults, "25")
 
-            with tab_md26:
-                render_md_tab(2026, df_mds, df_visits, df_md_consults, df_md_77470, "26", scan_77470_log)
+            if tab_md26.open:
+                with tab_md26:
+                    render_md_tab(2026, df_mds, df_visits, df_md_consults, df_md_77470, "26", scan_77470_log)
 
-            with tab_md25:
-                render_md_tab(2025, df_mds, df_visits, df_md_consults, df_md_77470, "25", scan_77470_log)
+            if tab_md25.open:
+                with tab_md25:
+                    render_md_tab(2025, df_mds, df_visits, df_md_consults, df_md_77470, "25", scan_77470_log)
 
-            with tab_app:
-                if df_apps.empty:
-                    st.info("No APP data found.")
-                else:
-                    # APP header with KPIs
-                    app_yrs = sorted(df_apps['Month_Clean'].dt.year.unique())
-                    app_cur_yr = max(app_yrs)
-                    app_pri_yr = app_cur_yr - 1
-                    df_app_cur = df_apps[df_apps['Month_Clean'].dt.year == app_cur_yr]
-                    df_app_pri = df_apps[df_apps['Month_Clean'].dt.year == app_pri_yr]
-                    app_cur_m  = set(df_app_cur['Month_Clean'].dt.month.unique())
-                    df_app_pri_cmp = df_app_pri[df_app_pri['Month_Clean'].dt.month.isin(app_cur_m)] if not df_app_pri.empty else pd.DataFrame()
-
-                    app_ytd_total  = df_app_cur['Total RVUs'].sum()
-                    app_pri_total  = df_app_pri_cmp['Total RVUs'].sum() if not df_app_pri_cmp.empty else 0
-                    app_yoy        = (app_ytd_total - app_pri_total) / app_pri_total * 100 if app_pri_total > 0 else 0
-                    net_total_ytd  = df_clinic[df_clinic['Month_Clean'].dt.year == app_cur_yr]['Total RVUs'].sum() if not df_clinic.empty else 0
-                    app_net_pct    = app_ytd_total / net_total_ytd * 100 if net_total_ytd > 0 else 0
-                    n_app_months   = df_app_cur['Month_Clean'].dt.month.nunique()
-
-                    st.markdown(
-                        f"<h2 style='color:#0f172a;margin-bottom:2px;'>👩‍⚕️ Advanced Practice Provider Analytics</h2>"
-                        f"<p style='color:#64748b;font-size:14px;margin-top:0;'>Year-to-date performance, E&M visit activity, and network contribution — {app_cur_yr}</p>",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown("---")
-
-                    # KPI row
-                    a1, a2, a3, a4 = st.columns(4)
-                    with a1:
-                        st.metric("APP wRVUs YTD", f"{app_ytd_total:,.0f}",
-                                  delta=f"{app_yoy:+.1f}% vs {app_pri_yr}" if app_pri_total > 0 else None)
-                    with a2:
-                        st.metric("% of Network Total", f"{app_net_pct:.1f}%",
-                                  help="APP wRVUs as share of total clinic network wRVUs")
-                    with a3:
-                        st.metric("Active APPs", str(df_app_cur['Name'].nunique()))
-                    with a4:
-                        app_proj = app_ytd_total / n_app_months * 12 if n_app_months > 0 else 0
-                        st.metric(f"Projected {app_cur_yr} Annual", f"{app_proj:,.0f}",
-                                  help=f"Linear extrapolation from {n_app_months}-month YTD")
-
-                    # Insight
-                    if app_ytd_total > 0:
-                        top_app = df_app_cur.groupby('Name')['Total RVUs'].sum().idxmax()
-                        render_insight_box(
-                            "APP Contribution Summary",
-                            f"APPs collectively generated <b>{app_ytd_total:,.0f} wRVUs</b> YTD ({app_cur_yr}), "
-                            f"representing <b>{app_net_pct:.1f}%</b> of total network volume. "
-                            f"YoY change: <b>{app_yoy:+.1f}%</b> vs same period {app_pri_yr}. "
-                            f"Top APP producer: <b>{top_app}</b>."
+            if tab_app.open:
+                with tab_app:
+                    if df_apps.empty:
+                        st.info("No APP data found.")
+                    else:
+                        # APP header with KPIs
+                        app_yrs = sorted(df_apps['Month_Clean'].dt.year.unique())
+                        app_cur_yr = max(app_yrs)
+                        app_pri_yr = app_cur_yr - 1
+                        df_app_cur = df_apps[df_apps['Month_Clean'].dt.year == app_cur_yr]
+                        df_app_pri = df_apps[df_apps['Month_Clean'].dt.year == app_pri_yr]
+                        app_cur_m  = set(df_app_cur['Month_Clean'].dt.month.unique())
+                        df_app_pri_cmp = df_app_pri[df_app_pri['Month_Clean'].dt.month.isin(app_cur_m)] if not df_app_pri.empty else pd.DataFrame()
+
+                        app_ytd_total  = df_app_cur['Total RVUs'].sum()
+                        app_pri_total  = df_app_pri_cmp['Total RVUs'].sum() if not df_app_pri_cmp.empty else 0
+                        app_yoy        = (app_ytd_total - app_pri_total) / app_pri_total * 100 if app_pri_total > 0 else 0
+                        net_total_ytd  = df_clinic[df_clinic['Month_Clean'].dt.year == app_cur_yr]['Total RVUs'].sum() if not df_clinic.empty else 0
+                        app_net_pct    = app_ytd_total / net_total_ytd * 100 if net_total_ytd > 0 else 0
+                        n_app_months   = len(app_cur_m)
+
+                        st.markdown(
+                            f"<h2 style='color:#0f172a;margin-bottom:2px;'>👩‍⚕️ Advanced Practice Provider Analytics</h2>"
+                            f"<p style='color:#64748b;font-size:14px;margin-top:0;'>Year-to-date performance, E&M visit activity, and network contribution — {app_cur_yr}</p>",
+                            unsafe_allow_html=True,
                         )
+                        st.markdown("---")
 
-                    st.info(generate_narrative(df_apps, "APP"))
-
-                    # wRVU Trend
-                    with st.container(border=True):
-                        render_section_header("wRVU/FTE Trend — All APPs",
-                                              "Monthly productivity trend by provider — normalized for FTE", "📅")
-                        fig_t = px.line(df_apps.sort_values('Month_Clean'), x='Month_Clean',
-                                        y='RVU per FTE', color='Name', markers=True,
-                                        labels={'Month_Clean':'Month', 'RVU per FTE':'wRVU / FTE'})
-                        st.plotly_chart(style_high_end_chart(fig_t), use_container_width=True,
-                                        key="app_trend_fte")
-
-                    # YTD total wRVU bar
-                    with st.container(border=True):
-                        render_section_header(f"APP YTD wRVU Comparison ({app_cur_yr})",
-                                              "Absolute production compared across APP providers", "🏆")
-                        app_ytd_bar = df_app_cur.groupby('Name')['Total RVUs'].sum().reset_index().sort_values('Total RVUs', ascending=False)
-                        if not df_app_pri_cmp.empty:
-                            app_pri_bar = df_app_pri_cmp.groupby('Name')['Total RVUs'].sum().reset_index()
-                            app_pri_bar.columns = ['Name', 'Prior RVUs']
-                            app_ytd_bar = app_ytd_bar.merge(app_pri_bar, on='Name', how='left').fillna({'Prior RVUs': 0})
-                            app_bar_melt = app_ytd_bar.melt(id_vars='Name', value_vars=['Total RVUs', 'Prior RVUs'])
-                            fig_ayb = px.bar(app_bar_melt, x='Name', y='value', color='variable',
-                                             barmode='group', text_auto='.2s',
-                                             color_discrete_map={'Total RVUs':'#1E3A8A','Prior RVUs':'#94a3b8'},
-                                             labels={'value':'wRVUs','variable':''})
-                        else:
-                            fig_ayb = px.bar(app_ytd_bar, x='Name', y='Total RVUs', text_auto='.2s',
-                                             color='Total RVUs', color_continuous_scale='Blues')
-                        st.plotly_chart(style_high_end_chart(fig_ayb), use_container_width=True, key="app_ytd_bar")
-
-                    st.markdown("---")
-                    if not df_app_cpt.empty:
-                        render_section_header("APP Independent Follow-up Visits (CPT 99212–99215)",
-                                              "E&M visit volume by code level — reflects clinical complexity and panel management activity", "🏥")
-                        with st.container(border=True):
-                            ytd_app = df_app_cpt.groupby(['Name', 'CPT Code'])['Count'].sum().reset_index()
-                            fig_ab = px.bar(ytd_app, x="Name", y="Count", color="CPT Code",
-                                            barmode="group", text_auto=True, title="YTD Follow-up Visits by CPT Code")
-                            st.plotly_chart(style_high_end_chart(fig_ab), use_container_width=True,
-                                            key="app_cpt_bar")
-                            st.caption(
-                                "Higher-complexity codes (99214, 99215) reflect patients with more complex, active management needs. "
-                                "A shift toward higher codes over time may indicate increasing panel acuity."
+                        # KPI row
+                        a1, a2, a3, a4 = st.columns(4)
+                        with a1:
+                            st.metric("APP wRVUs YTD", f"{app_ytd_total:,.0f}",
+                                      delta=f"{app_yoy:+.1f}% vs {app_pri_yr}" if app_pri_total > 0 else None)
+                        with a2:
+                            st.metric("% of Network Total", f"{app_net_pct:.1f}%",
+                                      help="APP wRVUs as share of total clinic network wRVUs")
+                        with a3:
+                            st.metric("Active APPs", str(df_app_cur['Name'].nunique()))
+                        with a4:
+                            app_proj = app_ytd_total / n_app_months * 12 if n_app_months > 0 else 0
+                            st.metric(f"Projected {app_cur_yr} Annual", f"{app_proj:,.0f}",
+                                      help=f"Linear extrapolation from {n_app_months}-month YTD")
+
+                        # Per-APP YTD totals, shared by the insight box and the YTD bar
+                        app_ytd_tot = df_app_cur.groupby('Name')['Total RVUs'].sum()
+
+                        # Insight
+                        if app_ytd_total > 0:
+                            top_app = app_ytd_tot.idxmax()
+                            render_insight_box(
+                                "APP Contribution Summary",
+                                f"APPs collectively generated <b>{app_ytd_total:,.0f} wRVUs</b> YTD ({app_cur_yr}), "
+                                f"representing <b>{app_net_pct:.1f}%</b> of total network volume. "
+                                f"YoY change: <b>{app_yoy:+.1f}%</b> vs same period {app_pri_yr}. "
+                                f"Top APP producer: <b>{top_app}</b>."
                             )
-                        cols = st.columns(2)
-                        for i, app_name in enumerate(df_app_cpt['Name'].unique()):
-                            with cols[i % 2]:
-                                with st.container(border=True):
-                                    render_section_header(app_name, "Monthly E&M visit volume by CPT code")
-                                    sub = df_app_cpt[df_app_cpt['Name'] == app_name]
-                                    piv_a = sub.pivot_table(index="CPT Code", columns="Month_Label", values="Count", aggfunc="sum").fillna(0)
-                                    sorted_ma = sub.sort_values("Month_Clean")["Month_Label"].unique()
-                                    piv_a = piv_a.reindex(columns=sorted_ma).fillna(0)
-                                    piv_a["Total"] = piv_a.sum(axis=1)
-                                    render_table(piv_a.style.format("{:,.0f}").background_gradient(cmap=_LC['Oranges']))
-
-            with tab_fin:
-                if df_financial.empty:
-                    st.info("No Financial data found.")
-                else:
-                    fin_view = st.radio("Select Financial View:", ["CPA By Provider", "CPA By Clinic"], key="fin_radio")
-                    if fin_view == "CPA By Provider":
-                        prov_fin = df_financial[(df_financial['Mode'] == 'Provider') & (df_financial['Name'] != "TN Proton Center")]
-                        if not prov_fin.empty:
-                            st.markdown("### 💰 CPA By Provider (YTD)")
-                            lfd = prov_fin['Month_Clean'].max()
-                            lp  = prov_fin[prov_fin['Month_Clean'] == lfd].groupby('Name', as_index=False)[['Charges','Payments']].sum()
-                            lp['% Payments/Charges'] = lp.apply(lambda x: x['Payments'] / x['Charges'] if x['Charges'] > 0 else 0, axis=1)
-                            c1, c2 = st.columns(2)
-                            with c1:
-                                fig_chg = px.bar(lp.sort_values('Charges', ascending=True), x='Charges', y='Name',
-                                                 orientation='h', title=f"Total Charges ({lfd.strftime('%b %Y')})", text_auto='$.2s')
-                                st.plotly_chart(style_high_end_chart(fig_chg), use_container_width=True)
-                            with c2:
-                                fig_pay = px.bar(lp.sort_values('Payments', ascending=True), x='Payments', y='Name',
-                                                 orientation='h', title=f"Total Payments ({lfd.strftime('%b %Y')})", text_auto='$.2s')
-                                st.plotly_chart(style_high_end_chart(fig_pay), use_container_width=True)
-                            fmt = {'Charges': '${:,.2f}', 'Payments': '${:,.2f}', '% Payments/Charges': '{:.1%}'}
-                            render_table(lp[['Name','Charges','Payments','% Payments/Charges']].sort_values('Charges', ascending=False).style
-                                         .format(fmt).background_gradient(cmap=_LC['Greens']))
-                    elif fin_view == "CPA By Clinic":
-                        cf = df_financial[df_financial['Mode'] == 'Clinic']
-                        if not cf.empty:
-                            st.markdown("### 🏥 CPA By Clinic")
-                            ytd = cf.groupby('Name')[['Charges','Payments']].sum().reset_index()
-                            ytd['% Payments/Charges'] = ytd.apply(lambda x: x['Payments'] / x['Charges'] if x['Charges'] > 0 else 0, axis=1)
-                            total_row = pd.DataFrame([{"Name": "TOTAL", "Charges": ytd['Charges'].sum(),
-                                                        "Payments": ytd['Payments'].sum(),
-                                                        "% Payments/Charges": ytd['Payments'].sum() / ytd['Charges'].sum() if ytd['Charges'].sum() > 0 else 0}])
-                            ytd_disp = pd.concat([ytd.sort_values('Charges', ascending=False), total_row], ignore_index=True)
-                            fmt = {'Charges': '${:,.2f}', 'Payments': '${:,.2f}', '% Payments/Charges': '{:.1%}'}
-                            st.markdown("#### 📆 Year to Date Charges & Payments")
-                            render_table(ytd_disp.style.format(fmt).background_gradient(cmap=_LC['Greens']))
-                            st.markdown("---")
-                            st.markdown("#### 📅 Monthly Data Breakdown")
-                            md_disp = cf[['Name','Month_Label','Charges','Payments']].copy()
-                            md_disp['% Payments/Charges'] = md_disp.apply(lambda x: x['Payments'] / x['Charges'] if x['Charges'] > 0 else 0, axis=1)
-                            md_disp['Month_Sort'] = pd.to_datetime(md_disp['Month_Label'], format='%b-%y')
-                            md_disp = md_disp.sort_values(['Month_Sort','Name'], ascending=[False, True]).drop(columns=['Month_Sort'])
-                            render_table(md_disp.style.format(fmt).background_gradient(cmap=_LC['Blues']))
-
-                    # ---- Advanced Financial Analytics (both views) ----
-                    st.markdown("---")
-                    render_section_header("Advanced Financial Analytics",
-                                          "Revenue cycle performance, collection rate trends, and efficiency metrics", "📐")
 
-                    # Collection rate trend
-                    cf_all = df_financial[df_financial['Mode'] == 'Clinic']
-                    if not cf_all.empty:
-                        with st.container(border=True):
-                            render_section_header("Payment Collection Rate Trend",
-                                                  "Monthly payment-to-charge ratio — sustained rates below average may indicate payer mix, coding, or billing cycle issues", "📈")
-                            cf_mo = cf_all.groupby('Month_Label')[['Charges','Payments']].sum().reset_index()
-                            cf_mo['Month_Sort'] = pd.to_datetime(cf_mo['Month_Label'], format='%b-%y', errors='coerce')
-                            cf_mo = cf_mo.dropna(subset=['Month_Sort']).sort_values('Month_Sort')
-                            cf_mo['Collection Rate'] = cf_mo['Payments'] / cf_mo['Charges']
-                            fig_cr = px.line(cf_mo, x='Month_Label', y='Collection Rate', markers=True,
-                                             title='Monthly Payment Collection Rate',
-                                             labels={'Month_Label':'Month','Collection Rate':'Collection Rate'})
-                            fig_cr.update_yaxes(tickformat='.1%')
-                            fig_cr.add_hline(y=cf_mo['Collection Rate'].mean(), line_dash='dash',
-                                             line_color='#64748b',
-                                             annotation_text=f"Avg {cf_mo['Collection Rate'].mean():.1%}",
-                                             annotation_position="right")
-                            st.plotly_chart(style_high_end_chart(fig_cr), use_container_width=True,
-                                            key="fin_coll_trend")
-
-                        # Charges vs Payments waterfall / grouped bar by clinic
-                        with st.container(border=True):
-                            render_section_header("Charges vs Payments by Clinic (YTD)",
-                                                  "Gap between charges and payments reflects contractual adjustments, write-offs, and payer mix", "🏦")
-                            ytd_cp = cf_all.groupby('Name')[['Charges','Payments']].sum().reset_index()
-                            ytd_cp = ytd_cp.sort_values('Charges', ascending=False)
-                            ytd_cp_melt = ytd_cp.melt(id_vars='Name', value_vars=['Charges','Payments'])
-                            fig_cpb = px.bar(ytd_cp_melt, x='Name', y='value', color='variable',
-                                             barmode='group', text_auto='$.2s',
-                                             color_discrete_map={'Charges':'#1E3A8A','Payments':'#22c55e'},
-                                             labels={'value':'Amount ($)','variable':''})
-                            st.plotly_chart(style_high_end_chart(fig_cpb), use_container_width=True,
-                                            key="fin_cpbar")
-
-                        # Collection rate heatmap: Clinic × Month
+                        st.info(generate_narrative(df_apps, "APP"))
+
+                        # wRVU Trend
                         with st.container(border=True):
-                            render_section_header("Collection Rate Heatmap: Clinic × Month",
-                                                  "Identifies which sites and months show anomalous collection performance", "🌡️")
-                            try:
-                                cf_piv = cf_all.copy()
-                                cf_piv['Collection Rate'] = cf_piv['Payments'] / cf_piv['Charges']
-                                piv_cr = cf_piv.pivot_table(index='Name', columns='Month_Label',
-                                                             values='Collection Rate', aggfunc='mean').fillna(0)
-                                ms_cr = cf_piv.copy()
-                                ms_cr['Month_Sort'] = pd.to_datetime(ms_cr['Month_Label'], format='%b-%y', errors='coerce')
-                                sorted_cr_m = ms_cr.dropna(subset=['Month_Sort']).sort_values('Month_Sort')['Month_Label'].unique()
-                                piv_cr = piv_cr.reindex(columns=sorted_cr_m).fillna(0)
-                                fig_crh = px.imshow(piv_cr, text_auto='.1%', aspect='auto',
-                                                    color_continuous_scale='RdYlGn',
-                                                    zmin=0.2, zmax=1.0,
-                                                    labels=dict(x='Month', y='Clinic', color='Collection Rate'))
-                                fig_crh.update_layout(height=max(300, len(piv_cr)*55))
-                                st.plotly_chart(style_high_end_chart(fig_crh), use_container_width=True,
-                                                key="fin_crheat")
-                            except Exception:
-                                pass
-
-                    # Revenue efficiency: provider-level payments per wRVU
-                    prov_fin_adv = df_financial[(df_financial['Mode'] == 'Provider') & (df_financial['Name'] != "TN Proton Center")]
-                    if not prov_fin_adv.empty and not df_md_global.empty:
+                            render_section_header("wRVU/FTE Trend — All APPs",
+                                                  "Monthly productivity trend by provider — normalized for FTE", "📅")
+                            fig_t = cached_chart('line', df_apps.sort_values('Month_Clean'), x='Month_Clean',
+                                            y='RVU per FTE', color='Name', markers=True,
+                                            labels={'Month_Clean':'Month', 'RVU per FTE':'wRVU / FTE'})
+                            st.plotly_chart(fig_t, use_container_width=True,
+                                            key="app_trend_fte")
+
+                        # YTD total wRVU bar
                         with st.container(border=True):
-                            render_section_header("Revenue Efficiency: Payments per wRVU by Physician",
-                                                  "Normalizes revenue performance by clinical workload — higher $/wRVU reflects better payer mix or contract rates", "💡")
-                            try:
-                                fin_ytd = prov_fin_adv.groupby('Name')[['Charges','Payments']].sum().reset_index()
-                                rvu_ytd = df_md_global.groupby('Name')['Total RVUs'].sum().reset_index()
-                                rev_eff = fin_ytd.merge(rvu_ytd, on='Name', how='inner')
-                                rev_eff = rev_eff[rev_eff['Total RVUs'] > 0]
-                                rev_eff['$/wRVU (Charges)']  = rev_eff['Charges']  / rev_eff['Total RVUs']
-                                rev_eff['$/wRVU (Payments)'] = rev_eff['Payments'] / rev_eff['Total RVUs']
-                                rev_eff = rev_eff.sort_values('$/wRVU (Payments)', ascending=False)
-                                fig_eff = px.bar(rev_eff, x='Name', y=['$/wRVU (Charges)','$/wRVU (Payments)'],
-                                                 barmode='group', text_auto='$.0f',
-                                                 color_discrete_sequence=['#1E3A8A','#22c55e'],
-                                                 labels={'value':'$ per wRVU','variable':''})
-                                st.plotly_chart(style_high_end_chart(fig_eff), use_container_width=True,
-                                                key="fin_reveff")
-                                fmt_re = {'Charges':'${:,.0f}','Payments':'${:,.0f}','Total RVUs':'{:,.0f}',
-                                          '$/wRVU (Charges)':'${:,.2f}','$/wRVU (Payments)':'${:,.2f}'}
-                                render_table(rev_eff[['Name','Total RVUs','Charges','Payments',
-                                                       '$/wRVU (Charges)','$/wRVU (Payments)']]
-                                             .style.format(fmt_re)
-                                             .background_gradient(subset=['$/wRVU (Payments)'], cmap=_LC['Greens']))
-                                st.caption("Higher $/wRVU reflects better payer mix or contract rates for that physician's patient population.")
-                            except Exception:
-                                pass
+                            render_section_header(f"APP YTD wRVU Comparison ({app_cur_yr})",
+                                                  "Absolute production compared across APP providers", "🏆")
+                            app_ytd_bar = app_ytd_tot.reset_index().sort_values('Total RVUs', ascending=False)
+                            if not df_app_pri_cmp.empty:
+                                app_ytd_bar['Prior RVUs'] = app_ytd_bar['Name'].map(
+                                    df_app_pri_cmp.groupby('Name', sort=False)['Total RVUs'].sum()).fillna(0)
+                                app_bar_melt = app_ytd_bar.melt(id_vars='Name', value_vars=['Total RVUs', 'Prior RVUs'])
+                                fig_ayb = cached_chart('bar', app_bar_melt, x='Name', y='value', color='variable',
+                                                 barmode='group', text_auto='.2s',
+                                                 color_discrete_map={'Total RVUs':'#1E3A8A','Prior RVUs':'#94a3b8'},
+                                                 labels={'value':'wRVUs','variable':''})
+                            else:
+                                fig_ayb = cached_chart('bar', app_ytd_bar, x='Name', y='Total RVUs', text_auto='.2s',
+                                                 color='Total RVUs', color_continuous_scale='Blues')
+                            st.plotly_chart(fig_ayb, use_container_width=True, key="app_ytd_bar")
+
+                        st.markdown("---")
+                        if not df_app_cpt.empty:
+                            render_section_header("APP Independent Follow-up Visits (CPT 99212–99215)",
+                                                  "E&M visit volume by code level — reflects clinical complexity and panel management activity", "🏥")
+                            with st.container(border=True):
+                                ytd_app = df_app_cpt.groupby(['Name', 'CPT Code'])['Count'].sum().reset_index()
+                                fig_ab = cached_chart('bar', ytd_app, x="Name", y="Count", color="CPT Code",
+                                                barmode="group", text_auto=True, title="YTD Follow-up Visits by CPT Code")
+                                st.plotly_chart(fig_ab, use_container_width=True,
+                                                key="app_cpt_bar")
+                                st.caption(
+                                    "Higher-complexity codes (99214, 99215) reflect patients with more complex, active management needs. "
+                                    "A shift toward higher codes over time may indicate increasing panel acuity."
+                                )
+                            cols = st.columns(2)
+                            for i, app_name in enumerate(df_app_cpt['Name'].unique()):
+                                with cols[i % 2]:
+                                    with st.container(border=True):
+                                        render_section_header(app_name, "Monthly E&M visit volume by CPT code")
+                                        sub = df_app_cpt[df_app_cpt['Name'] == app_name]
+                                        piv_a = pivot_sum(sub, "CPT Code", "Month_Label", "Count")
+                                        sorted_ma = month_order(sub)
+                                        piv_a = piv_a.reindex(columns=sorted_ma).fillna(0)
+                                        piv_a["Total"] = piv_a.sum(axis=1)
+                                        render_table(piv_a.style.format("{:,.0f}").pipe(gradient, 'Oranges'))
+
+            if tab_fin.open:
+                with tab_fin:
+                    if df_financial.empty:
+                        st.info("No Financial data found.")
+                    else:
+                        fin_view = st.radio("Select Financial View:", ["CPA By Provider", "CPA By Clinic"], key="fin_radio")
+                        if fin_view == "CPA By Provider":
+                            prov_fin = df_financial[(df_financial['Mode'] == 'Provider') & (df_financial['Name'] != "TN Proton Center")]
+                            if not prov_fin.empty:
+                                st.markdown("### 💰 CPA By Provider (YTD)")
+                                lfd = prov_fin['Month_Clean'].max()
+                                lp  = prov_fin[prov_fin['Month_Clean'] == lfd].groupby('Name', as_index=False)[['Charges','Payments']].sum()
+                                lp['% Payments/Charges'] = safe_ratio(lp['Payments'], lp['Charges'])
+                                c1, c2 = st.columns(2)
+                                with c1:
+                                    fig_chg = cached_chart('bar', lp.sort_values('Charges', ascending=True), x='Charges', y='Name',
+                                                     orientation='h', title=f"Total Charges ({lfd.strftime('%b %Y')})", text_auto='$.2s')
+                                    st.plotly_chart(fig_chg, use_container_width=True)
+                                with c2:
+                                    fig_pay = cached_chart('bar', lp.sort_values('Payments', ascending=True), x='Payments', y='Name',
+                                                     orientation='h', title=f"Total Payments ({lfd.strftime('%b %Y')})", text_auto='$.2s')
+                                    st.plotly_chart(fig_pay, use_container_width=True)
+                                fmt = {'Charges': '${:,.2f}', 'Payments': '${:,.2f}', '% Payments/Charges': '{:.1%}'}
+                                render_table(lp[['Name','Charges','Payments','% Payments/Charges']].sort_values('Charges', ascending=False).style
+                                             .format(fmt).pipe(gradient, 'Greens'))
+                        elif fin_view == "CPA By Clinic":
+                            cf = df_financial[df_financial['Mode'] == 'Clinic']
+                            if not cf.empty:
+                                st.markdown("### 🏥 CPA By Clinic")
+                                ytd = cf.groupby('Name')[['Charges','Payments']].sum().reset_index()
+                                ytd['% Payments/Charges'] = safe_ratio(ytd['Payments'], ytd['Charges'])
+                                total_row = pd.DataFrame([{"Name": "TOTAL", "Charges": ytd['Charges'].sum(),
+                                                            "Payments": ytd['Payments'].sum(),
+                                                            "% Payments/Charges": ytd['Payments'].sum() / ytd['Charges'].sum() if ytd['Charges'].sum() > 0 else 0}])
+                                ytd_disp = pd.concat([ytd.sort_values('Charges', ascending=False), total_row], ignore_index=True)
+                                fmt = {'Charges': '${:,.2f}', 'Payments': '${:,.2f}', '% Payments/Charges': '{:.1%}'}
+                                st.markdown("#### 📆 Year to Date Charges & Payments")
+                                render_table(ytd_disp.style.format(fmt).pipe(gradient, 'Greens'))
+                                st.markdown("---")
+                                st.markdown("#### 📅 Monthly Data Breakdown")
+                                md_disp = cf[['Name','Month_Label','Charges','Payments']]
+                                md_disp['% Payments/Charges'] = safe_ratio(md_disp['Payments'], md_disp['Charges'])
+                                md_disp['Month_Sort'] = pd.to_datetime(md_disp['Month_Label'], format='%b-%y')
+                                md_disp = md_disp.sort_values(['Month_Sort','Name'], ascending=[False, True]).drop(columns=['Month_Sort'])
+                                render_table(md_disp.style.format(fmt).pipe(gradient, 'Blues'))
+
+                        # ---- Advanced Financial Analytics (both views) ----
+                        st.markdown("---")
+                        render_section_header("Advanced Financial Analytics",
+                                              "Revenue cycle performance, collection rate trends, and efficiency metrics", "📐")
+
+                        # Collection rate trend
+                        cf_all = df_financial[df_financial['Mode'] == 'Clinic']
+                        if not cf_all.empty:
+                            with st.container(border=True):
+                                render_section_header("Payment Collection Rate Trend",
+                                                      "Monthly payment-to-charge ratio — sustained rates below average may indicate payer mix, coding, or billing cycle issues", "📈")
+                                cf_mo = cf_all.groupby('Month_Label')[['Charges','Payments']].sum().reset_index()
+                                cf_mo['Month_Sort'] = pd.to_datetime(cf_mo['Month_Label'], format='%b-%y', errors='coerce')
+                                cf_mo = cf_mo.dropna(subset=['Month_Sort']).sort_values('Month_Sort')
+                                cf_mo['Collection Rate'] = cf_mo['Payments'] / cf_mo['Charges']
+                                fig_cr = px.line(cf_mo, x='Month_Label', y='Collection Rate', markers=True,
+                                                 title='Monthly Payment Collection Rate',
+                                                 labels={'Month_Label':'Month','Collection Rate':'Collection Rate'})
+                                fig_cr.update_yaxes(tickformat='.1%')
+                                fig_cr.add_hline(y=cf_mo['Collection Rate'].mean(), line_dash='dash',
+                                                 line_color='#64748b',
+                                                 annotation_text=f"Avg {cf_mo['Collection Rate'].mean():.1%}",
+                                                 annotation_position="right")
+                                st.plotly_chart(style_high_end_chart(fig_cr), use_container_width=True,
+                                                key="fin_coll_trend")
+
+                            # Charges vs Payments waterfall / grouped bar by clinic
+                            with st.container(border=True):
+                                render_section_header("Charges vs Payments by Clinic (YTD)",
+                                                      "Gap between charges and payments reflects contractual adjustments, write-offs, and payer mix", "🏦")
+                                ytd_cp = cf_all.groupby('Name')[['Charges','Payments']].sum().reset_index()
+                                ytd_cp = ytd_cp.sort_values('Charges', ascending=False)
+                                ytd_cp_melt = ytd_cp.melt(id_vars='Name', value_vars=['Charges','Payments'])
+                                fig_cpb = cached_chart('bar', ytd_cp_melt, x='Name', y='value', color='variable',
+                                                 barmode='group', text_auto='$.2s',
+                                                 color_discrete_map={'Charges':'#1E3A8A','Payments':'#22c55e'},
+                                                 labels={'value':'Amount ($)','variable':''})
+                                st.plotly_chart(fig_cpb, use_container_width=True,
+                                                key="fin_cpbar")
+
+                            # Collection rate heatmap: Clinic × Month
+                            with st.container(border=True):
+                                render_section_header("Collection Rate Heatmap: Clinic × Month",
+                                                      "Identifies which sites and months show anomalous collection performance", "🌡️")
+                                try:
+                                    cf_piv = cf_all.assign(**{'Collection Rate': cf_all['Payments'] / cf_all['Charges']})
+                                    piv_cr = (cf_piv.groupby(['Name', 'Month_Label'])['Collection Rate'].mean()
+                                              .unstack().dropna(how='all').fillna(0))
+                                    sorted_cr_m = month_order(cf_piv)
+                                    piv_cr = piv_cr.reindex(columns=sorted_cr_m).fillna(0)
+                                    fig_crh = build_chart('imshow', piv_cr, text_auto='.1%', aspect='auto',
+                                                          color_continuous_scale='RdYlGn', zmin=0.2, zmax=1.0,
+                                                          labels=dict(x='Month', y='Clinic', color='Collection Rate'),
+                                                          layout=dict(height=max(300, len(piv_cr)*55)))
+                                    st.plotly_chart(fig_crh, use_container_width=True,
+                                                    key="fin_crheat")
+                                except Exception:
+                                    pass
+
+                        # Revenue efficiency: provider-level payments per wRVU
+                        prov_fin_adv = df_financial[(df_financial['Mode'] == 'Provider') & (df_financial['Name'] != "TN Proton Center")]
+                        if not prov_fin_adv.empty and not df_md_global.empty:
+                            with st.container(border=True):
+                                render_section_header("Revenue Efficiency: Payments per wRVU by Physician",
+                                                      "Normalizes revenue performance by clinical workload — higher $/wRVU reflects better payer mix or contract rates", "💡")
+                                try:
+                                    fin_ytd = prov_fin_adv.groupby('Name')[['Charges','Payments']].sum().reset_index()
+                                    rvu_ytd = df_md_global.groupby('Name')['Total RVUs'].sum().reset_index()
+                                    rev_eff = fin_ytd.merge(rvu_ytd, on='Name', how='inner')
+                                    rev_eff = rev_eff[rev_eff['Total RVUs'] > 0]
+                                    rev_eff['$/wRVU (Charges)']  = rev_eff['Charges']  / rev_eff['Total RVUs']
+                                    rev_eff['$/wRVU (Payments)'] = rev_eff['Payments'] / rev_eff['Total RVUs']
+                                    rev_eff = rev_eff.sort_values('$/wRVU (Payments)', ascending=False)
+                                    fig_eff = cached_chart('bar', rev_eff, x='Name', y=['$/wRVU (Charges)','$/wRVU (Payments)'],
+                                                     barmode='group', text_auto='$.0f',
+                                                     color_discrete_sequence=['#1E3A8A','#22c55e'],
+                                                     labels={'value':'$ per wRVU','variable':''})
+                                    st.plotly_chart(fig_eff, use_container_width=True,
+                                                    key="fin_reveff")
+                                    fmt_re = {'Charges':'${:,.0f}','Payments':'${:,.0f}','Total RVUs':'{:,.0f}',
+                                              '$/wRVU (Charges)':'${:,.2f}','$/wRVU (Payments)':'${:,.2f}'}
+                                    render_table(rev_eff[['Name','Total RVUs','Charges','Payments',
+                                                           '$/wRVU (Charges)','$/wRVU (Payments)']]
+                                                 .style.format(fmt_re)
+                                                 .pipe(gradient, 'Greens', subset=['$/wRVU (Payments)']))
+                                    st.caption("Higher $/wRVU reflects better payer mix or contract rates for that physician's patient population.")
+                                except Exception:
+                                    pass
 
     else:
         st.info("👋 Ready. Add files to the 'Reports' folder in GitHub to load data.")